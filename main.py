@@ -34,6 +34,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed", "Retry-After"],
 )
 
 
@@ -41,6 +42,21 @@ app.add_middleware(
 async def exception_handler(rq: Request, exc: ServerException):
     if exc.exception_type is ExceptionTypes.TOKEN_INVALID:
         return JSONResponse(status_code=401, content=exc.detail)
+    if exc.exception_type is ExceptionTypes.RATE_LIMITED:
+        return JSONResponse(
+            status_code=429,
+            content=exc.detail,
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    if exc.exception_type in (
+        ExceptionTypes.AGENT_QUEUE_FULL,
+        ExceptionTypes.LLM_UNAVAILABLE,
+    ):
+        return JSONResponse(
+            status_code=503,
+            content=exc.detail,
+            headers={"Retry-After": str(exc.retry_after or 1)},
+        )
     return JSONResponse(
         status_code=418,
         content=exc.detail,
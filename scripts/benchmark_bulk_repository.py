@@ -0,0 +1,119 @@
+"""
+Benchmark: `Repository.create_many/upsert_many/update_many` against the
+per-row `create/update` path they replace.
+
+Runs against the database configured in `configs/main.json`; the rows are
+written as the messages of a throw-away chat session, which is deleted (with
+its messages) at the end:
+
+    python scripts/benchmark_bulk_repository.py --rows 2000
+
+Each path writes the same rows; the report lists the wall time and the
+rows per second of every path, and the speedup of the bulk one.
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, List
+
+from pylib_0xe.string.generate_id import GenerateId
+
+from src.models.chat_message import ChatMessage
+from src.models.chat_session import ChatSession
+from src.repositories.repository import Repository
+
+
+def messages(session_id: str, ids: List[str], content: str) -> List[ChatMessage]:
+    # transient rows with known ids, so no returned entity has to be reloaded
+    return [
+        ChatMessage(id=id, session_id=session_id, seq=seq, role="user", content=content)
+        for seq, id in enumerate(ids)
+    ]
+
+
+def timed(name: str, rows: int, write: Callable[[], None]) -> float:
+    started = time.perf_counter()
+    write()
+    elapsed = time.perf_counter() - started
+    print(f"{name:>16}: {elapsed * 1000:9.1f}ms {rows / elapsed:10.0f} rows/s")
+    return elapsed
+
+
+def compare(
+    name: str, rows: int, per_row: Callable[[], None], bulk: Callable[[], None]
+) -> None:
+    slow = timed(f"{name} per-row", rows, per_row)
+    fast = timed(f"{name} bulk", rows, bulk)
+    print(f"{'':>16}  speedup x{slow / fast:.1f}")
+
+
+def run(args: argparse.Namespace) -> int:
+    sessions = Repository(ChatSession)
+    repository = Repository(ChatMessage)
+    # one session per path, so the bulk inserts do not hit the per-row rows
+    per_row_id, bulk_id = GenerateId.generate(), GenerateId.generate()
+    sessions.create(ChatSession(id=per_row_id))
+    sessions.create(ChatSession(id=bulk_id))
+    per_row = [GenerateId.generate() for _ in range(args.rows)]
+    bulk = [GenerateId.generate() for _ in range(args.rows)]
+    try:
+        compare(
+            "create",
+            args.rows,
+            lambda: [
+                repository.create(message)
+                for message in messages(per_row_id, per_row, "created")
+            ],
+            lambda: repository.create_many(
+                messages(bulk_id, bulk, "created"),
+                chunk_size=args.chunk_size,
+            ),
+        )
+        compare(
+            "update",
+            args.rows,
+            lambda: [
+                repository.update(message)
+                for message in messages(per_row_id, per_row, "updated")
+            ],
+            lambda: repository.update_many(
+                messages(bulk_id, bulk, "updated"),
+                chunk_size=args.chunk_size,
+            ),
+        )
+        # per-row upserts run as one-entity statements, one transaction each
+        compare(
+            "upsert",
+            args.rows,
+            lambda: [
+                repository.upsert_many([message], ("session_id", "seq"))
+                for message in messages(per_row_id, per_row, "upserted")
+            ],
+            lambda: repository.upsert_many(
+                messages(bulk_id, bulk, "upserted"),
+                ("session_id", "seq"),
+                chunk_size=args.chunk_size,
+            ),
+        )
+    finally:
+        for session_id in (per_row_id, bulk_id):
+            chat_session, db_session = sessions.read_by_id(session_id)
+            sessions.delete(chat_session, session=db_session)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="rows per statement (default: main.database.bulk_chunk_size)",
+    )
+    return run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
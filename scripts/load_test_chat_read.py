@@ -0,0 +1,201 @@
+"""
+Load test: `/chat/read` latency must stay flat while agent turns wait on a
+slow LLM, i.e. pending completions may not block the event loop.
+
+1. Start a fake OpenAI-compatible provider whose completions take
+   `--delay` seconds:
+
+       python scripts/load_test_chat_read.py serve-llm --port 9100 --delay 5
+
+2. Start the API against it, with rate limiting disabled
+   (`main.rate_limit.enabled: false`) so the test is not throttled:
+
+       base_url=http://127.0.0.1:9100/v1 openai_api_key=fake \\
+           uvicorn main:app --port 8000
+
+3. Measure `/chat/read` before and while the turns are pending:
+
+       python scripts/load_test_chat_read.py run --api http://127.0.0.1:8000/api/v0.0.1
+
+   `--api` defaults to that address, with the version from `configs/api.json`.
+
+The run fails when the p99 under load exceeds `--max-ratio` times the idle
+p99 (plus `--slack` milliseconds for noise).
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+REPLY = "Which programming languages does the role require?"
+EMPTY_DRAFT = {
+    "company_name": None,
+    "company_industry": None,
+    "job_position": None,
+    "general_responsibilities": None,
+    "requirements": [],
+}
+# the routes are mounted under /api/v{version}, see main.py and src/api/router.py
+API_VERSION = json.loads(
+    (Path(__file__).resolve().parents[1] / "configs" / "api.json").read_text()
+)["version"]
+
+
+def fake_llm(delay: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        await asyncio.sleep(delay)
+        model = body.get("model", "fake")
+        if body.get("stream"):
+            return StreamingResponse(_chunks(model), media_type="text/event-stream")
+        message: Dict[str, Any] = {"role": "assistant", "content": REPLY}
+        if body.get("tools"):
+            name = body["tools"][0]["function"]["name"]
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": "call_0",
+                        "type": "function",
+                        "function": {
+                            "name": name,
+                            "arguments": json.dumps(EMPTY_DRAFT),
+                        },
+                    }
+                ],
+            }
+        return JSONResponse(
+            {
+                "id": "fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            }
+        )
+
+    return app
+
+
+async def _chunks(model: str):
+    for delta, finish_reason in (
+        ({"role": "assistant", "content": REPLY}, None),
+        ({}, "stop"),
+    ):
+        chunk = {
+            "id": "fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+async def measure_reads(
+    client: httpx.AsyncClient,
+    session_ids: List[str],
+    requests: int,
+    concurrency: int,
+) -> List[float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def read(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(
+                f"/chat/read/{session_ids[index % len(session_ids)]}"
+            )
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    await asyncio.gather(*(read(index) for index in range(requests)))
+    return latencies
+
+
+def percentile(latencies: List[float], q: int) -> float:
+    return statistics.quantiles(latencies, n=100)[q - 1] * 1000
+
+
+def report(name: str, latencies: List[float]) -> float:
+    p99 = percentile(latencies, 99)
+    print(
+        f"{name:>8}: n={len(latencies)} p50={percentile(latencies, 50):.1f}ms "
+        f"p95={percentile(latencies, 95):.1f}ms p99={p99:.1f}ms"
+    )
+    return p99
+
+
+async def run(args: argparse.Namespace) -> int:
+    async with httpx.AsyncClient(base_url=args.api, timeout=60) as client:
+        session_ids = []
+        for _ in range(args.sessions):
+            response = await client.get("/chat/create")
+            response.raise_for_status()
+            session_ids.append(response.json()["id"])
+        # let the greetings finish, so the idle phase really is idle
+        await asyncio.sleep(args.delay * 2)
+        idle = await measure_reads(client, session_ids, args.requests, args.concurrency)
+
+        for session_id in session_ids:
+            response = await client.post(
+                f"/chat/update/{session_id}/user-message",
+                json="We are ZimboTech, hiring a backend engineer.",
+            )
+            response.raise_for_status()
+        started = time.perf_counter()
+        loaded = await measure_reads(
+            client, session_ids, args.requests, args.concurrency
+        )
+        if time.perf_counter() - started > args.delay:
+            print("warning: reads outlasted the LLM delay, raise --delay")
+
+    idle_p99 = report("idle", idle)
+    loaded_p99 = report("pending", loaded)
+    limit = idle_p99 * args.max_ratio + args.slack
+    if loaded_p99 > limit:
+        print(f"FAIL: p99 {loaded_p99:.1f}ms exceeds {limit:.1f}ms")
+        return 1
+    print(f"OK: p99 {loaded_p99:.1f}ms within {limit:.1f}ms")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve-llm", help="run the slow fake provider")
+    serve.add_argument("--port", type=int, default=9100)
+    serve.add_argument("--delay", type=float, default=5.0)
+    load = commands.add_parser("run", help="measure /chat/read")
+    load.add_argument("--api", default=f"http://127.0.0.1:8000/api/v{API_VERSION}")
+    load.add_argument("--sessions", type=int, default=20)
+    load.add_argument("--requests", type=int, default=500)
+    load.add_argument("--concurrency", type=int, default=20)
+    load.add_argument("--delay", type=float, default=5.0, help="the fake delay")
+    load.add_argument("--max-ratio", type=float, default=2.0)
+    load.add_argument("--slack", type=float, default=20.0, help="milliseconds")
+    args = parser.parse_args()
+    if args.command == "serve-llm":
+        uvicorn.run(fake_llm(args.delay), port=args.port)
+        return 0
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Dict, List
+from pylib_0xe.utils.time.get_current_time import GetCurrentTime
+from sqlalchemy import update
+
+from src.database.database_engine import DatabaseEngine
+from src.models.chat_message import ChatMessage
+from src.models.chat_session import ChatSession
+
+
+@dataclass
+class AppendChatMessages:
+    """
+    Inserts the messages of one turn after the `start_seq` already stored
+    messages; the rest of the history is never rewritten.
+    """
+
+    session_id: str
+    start_seq: int
+    messages: List[Dict[str, str]]
+
+    async def append(self) -> List[ChatMessage]:
+        rows = [
+            ChatMessage(
+                session_id=self.session_id,
+                seq=self.start_seq + index,
+                role=message["role"],
+                content=message["content"],
+            )
+            for index, message in enumerate(self.messages)
+        ]
+        if not rows:
+            return rows
+        async with DatabaseEngine().async_session_maker() as db_session:
+            async with db_session.begin():
+                db_session.add_all(rows)
+                await db_session.execute(
+                    update(ChatSession)
+                    .where(ChatSession.id == self.session_id)
+                    .values(updated_at=GetCurrentTime.get())
+                )
+        return rows
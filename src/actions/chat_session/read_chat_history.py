@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from src.actions.chat_session.append_chat_messages import AppendChatMessages
+from src.models.chat_message import ChatMessage
+from src.models.chat_session import ChatSession
+from src.repositories.async_repository import AsyncRepository
+from src.repositories.chat_message_repository import ChatMessageRepository
+
+
+@dataclass
+class ReadChatHistory:
+    """
+    Builds the `messages` list of a session from its `chat_messages` rows,
+    leaving out system prompts, and returns it with the next free `seq`.
+    Sessions that still carry the legacy `messages` list are moved into
+    `chat_messages` on first read.
+    """
+
+    chat_session: ChatSession
+
+    async def read(self) -> Tuple[List[Dict[str, str]], int]:
+        rows, _ = await ChatMessageRepository(ChatMessage).read_by_session_id(
+            self.chat_session.id
+        )
+        if rows:
+            return [row.to_message() for row in rows if row.role != "system"], rows[
+                -1
+            ].seq + 1
+
+        if not self.chat_session.messages:
+            return [], 0
+
+        messages = [
+            message
+            for message in self.chat_session.messages
+            if message["role"] != "system"
+        ]
+        await AppendChatMessages(self.chat_session.id, 0, messages).append()
+        self.chat_session.messages = None
+        await AsyncRepository(ChatSession).update(self.chat_session)
+        return messages, len(messages)
@@ -1,21 +1,50 @@
+import json
 from dataclasses import dataclass
-from pylib_0xe.database.actions.release_session import ReleaseSession
-from pylib_0xe.types.database_types import DatabaseTypes
+from pylib_0xe.utils.time.get_current_time import GetCurrentTime
+from sqlalchemy import delete, update
 
+from src.database.database_engine import DatabaseEngine
+from src.models.chat_message import ChatMessage
 from src.models.chat_session import ChatSession
-from src.repositories.repository import Repository
+from src.repositories.async_repository import AsyncRepository
 
 
 @dataclass
 class UpdateChatSession:
+    """
+    Replaces the whole stored history of a session with `messages`.
+    Regular turns only append through `AppendChatMessages`.
+    """
+
     session_id: str
     messages: str
 
-    def update(self) -> ChatSession:
-        chat_session, db_session = Repository(ChatSession).read_by_id(
-            self.session_id, db_session_keep_alive=True
-        )
-        chat_session.messages = self.messages
-        db_session.commit()
-        ReleaseSession(DatabaseTypes.I, db_session).release()
+    async def update(self) -> ChatSession:
+        chat_session, _ = await AsyncRepository(ChatSession).read_by_id(self.session_id)
+        async with DatabaseEngine().async_session_maker() as db_session:
+            async with db_session.begin():
+                await db_session.execute(
+                    delete(ChatMessage).where(ChatMessage.session_id == self.session_id)
+                )
+                await db_session.execute(
+                    update(ChatSession)
+                    .where(ChatSession.id == self.session_id)
+                    .values(
+                        messages=None,
+                        summary=None,
+                        summarized_count=0,
+                        updated_at=GetCurrentTime.get(),
+                    )
+                )
+                db_session.add_all(
+                    [
+                        ChatMessage(
+                            session_id=self.session_id,
+                            seq=seq,
+                            role=message["role"],
+                            content=message["content"],
+                        )
+                        for seq, message in enumerate(json.loads(self.messages))
+                    ]
+                )
         return chat_session
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import update
+
+from src.database.database_engine import DatabaseEngine
+from src.models.chat_session import ChatSession
+
+
+@dataclass
+class UpdateChatSummary:
+    session_id: str
+    summary: Optional[str]
+    summarized_count: int
+
+    async def update(self) -> None:
+        async with DatabaseEngine().async_session_maker() as db_session:
+            async with db_session.begin():
+                await db_session.execute(
+                    update(ChatSession)
+                    .where(ChatSession.id == self.session_id)
+                    .values(
+                        summary=self.summary, summarized_count=self.summarized_count
+                    )
+                )
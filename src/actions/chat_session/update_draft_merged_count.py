@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from sqlalchemy import update
+
+from src.database.database_engine import DatabaseEngine
+from src.models.chat_session import ChatSession
+
+
+@dataclass
+class UpdateDraftMergedCount:
+    session_id: str
+    draft_merged_count: int
+
+    async def update(self) -> None:
+        async with DatabaseEngine().async_session_maker() as db_session:
+            async with db_session.begin():
+                await db_session.execute(
+                    update(ChatSession)
+                    .where(ChatSession.id == self.session_id)
+                    .values(draft_merged_count=self.draft_merged_count)
+                )
@@ -0,0 +1,132 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Type
+from pylib_0xe.utils.time.get_current_time import GetCurrentTime
+from sqlalchemy import String, cast, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.company_requirement import CompanyRequirement
+from src.models.decorated_base import DecoratedBase
+from src.models.field_facet_count import FieldFacetCount
+from src.models.stack_facet_count import StackFacetCount
+from src.models.term_facet_count import TermFacetCount
+
+
+@dataclass
+class CountRequirementFacets:
+    """
+    Moves the facet counts from the `removed` to the `added` requirement rows
+    of one company, inside the caller's transaction. Count rows are updated
+    in key order, so concurrent indexing cannot deadlock on them.
+    """
+
+    removed: List[CompanyRequirement]
+    added: List[CompanyRequirement]
+
+    async def count(self, db_session: AsyncSession) -> None:
+        fields: Dict[Tuple[str, ...], int] = defaultdict(int)
+        stacks: Dict[Tuple[str, ...], int] = defaultdict(int)
+        terms: Dict[Tuple[str, ...], int] = defaultdict(int)
+        for sign, rows in ((-1, self.removed), (1, self.added)):
+            # fields and stacks count companies, terms count occurrences
+            for field in {row.stack_field for row in rows}:
+                fields[(field,)] += sign
+            for stack in {(row.stack_field, row.stack_name) for row in rows}:
+                stacks[stack] += sign
+            for row in rows:
+                for term in row.deep_requirements:
+                    terms[(row.stack_field, row.stack_name, term)] += sign
+        await self._add(db_session, FieldFacetCount, ("stack_field",), fields)
+        await self._add(
+            db_session, StackFacetCount, ("stack_field", "stack_name"), stacks
+        )
+        await self._add(
+            db_session,
+            TermFacetCount,
+            ("stack_field", "stack_name", "term"),
+            terms,
+            column="count",
+        )
+
+    @staticmethod
+    async def rebuild(db_session: AsyncSession) -> None:
+        """Recounts every facet from `company_requirements`, e.g. after a re-index."""
+        # indexing waits meanwhile, so no count moves during the recount
+        await db_session.execute(text("LOCK TABLE company_requirements IN SHARE MODE"))
+        for model in (FieldFacetCount, StackFacetCount, TermFacetCount):
+            await db_session.execute(delete(model))
+        companies = func.count(CompanyRequirement.company_id.distinct())
+        await db_session.execute(
+            _recount(
+                FieldFacetCount,
+                ["stack_field", "companies"],
+                select(CompanyRequirement.stack_field, companies).group_by(
+                    CompanyRequirement.stack_field
+                ),
+            )
+        )
+        await db_session.execute(
+            _recount(
+                StackFacetCount,
+                ["stack_field", "stack_name", "companies"],
+                select(
+                    CompanyRequirement.stack_field,
+                    CompanyRequirement.stack_name,
+                    companies,
+                ).group_by(
+                    CompanyRequirement.stack_field, CompanyRequirement.stack_name
+                ),
+            )
+        )
+        terms = select(
+            CompanyRequirement.stack_field,
+            CompanyRequirement.stack_name,
+            func.unnest(CompanyRequirement.deep_requirements).label("term"),
+        ).subquery()
+        await db_session.execute(
+            _recount(
+                TermFacetCount,
+                ["stack_field", "stack_name", "term", "count"],
+                select(
+                    terms.c.stack_field, terms.c.stack_name, terms.c.term, func.count()
+                ).group_by(terms.c.stack_field, terms.c.stack_name, terms.c.term),
+            )
+        )
+
+    @staticmethod
+    async def _add(
+        db_session: AsyncSession,
+        model: Type[DecoratedBase],
+        keys: Tuple[str, ...],
+        deltas: Dict[Tuple[str, ...], int],
+        column: str = "companies",
+    ) -> None:
+        rows = [
+            {**dict(zip(keys, key)), column: delta}
+            for key, delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+        statement = insert(model).values(rows)
+        await db_session.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={
+                    column: getattr(model, column) + statement.excluded[column],
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+        )
+
+
+def _recount(model: Type[DecoratedBase], columns: List[str], counts):
+    # INSERT ... SELECT runs no Python-side defaults
+    now = GetCurrentTime.get()
+    counts = counts.add_columns(
+        cast(func.gen_random_uuid(), String), literal(now), literal(now)
+    )
+    return insert(model).from_select(
+        columns + ["id", "created_at", "updated_at"], counts
+    )
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.actions.company.count_requirement_facets import CountRequirementFacets
+from src.models.company import Company
+from src.models.company_requirement import CompanyRequirement
+
+
+@dataclass
+class IndexCompanyRequirements:
+    """
+    Replaces the `company_requirements` rows of one company with the stacks
+    found in its data, and moves the facet counts along, inside the caller's
+    transaction.
+    """
+
+    company: Company
+
+    async def index(self, db_session: AsyncSession) -> List[CompanyRequirement]:
+        removed = list(
+            await db_session.scalars(
+                delete(CompanyRequirement)
+                .where(CompanyRequirement.company_id == self.company.id)
+                .returning(CompanyRequirement)
+            )
+        )
+        rows = [
+            CompanyRequirement(
+                company_id=self.company.id,
+                stack_field=CompanyRequirement.normalize(
+                    requirement.get("stack_field", "")
+                ),
+                stack_name=CompanyRequirement.normalize(requirement["stack_name"]),
+                deep_requirements=[
+                    CompanyRequirement.normalize(term)
+                    for term in requirement.get("deep_requirements") or []
+                    if str(term).strip()
+                ],
+            )
+            for requirement in self._requirements()
+            if str(requirement.get("stack_name") or "").strip()
+        ]
+        db_session.add_all(rows)
+        await db_session.flush()
+        await CountRequirementFacets(removed, rows).count(db_session)
+        return rows
+
+    def _requirements(self) -> List[Dict[str, Any]]:
+        data = self.company.data
+        if not isinstance(data, dict):
+            return []
+        return [
+            requirement
+            for requirement in data.get("requirements") or []
+            if isinstance(requirement, dict)
+        ]
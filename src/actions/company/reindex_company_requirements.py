@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from src.actions.company.count_requirement_facets import CountRequirementFacets
+from src.actions.company.index_company_requirements import IndexCompanyRequirements
+from src.database.database_engine import DatabaseEngine
+from src.models.company import Company
+from src.repositories.async_repository import AsyncRepository
+from src.repositories.company_repository import CompanyRepository
+from src.types.company_status import CompanyStatus
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ReindexCompanyRequirements:
+    """
+    Rebuilds the search index of every final company, e.g. after a back-fill;
+    drafts are not searchable. The facet counts are recounted afterwards.
+    """
+
+    batch_size: int = 500
+
+    async def reindex(self) -> int:
+        count = 0
+        batch = []
+        async for company in AsyncRepository(Company).stream(
+            filters=[CompanyRepository.with_status(CompanyStatus.FINAL)]
+        ):
+            batch.append(company)
+            if len(batch) >= self.batch_size:
+                count += await self._index(batch)
+                batch = []
+        if batch:
+            count += await self._index(batch)
+        async with DatabaseEngine().async_session_maker() as db_session:
+            async with db_session.begin():
+                await CountRequirementFacets.rebuild(db_session)
+        LOGGER.info(f"re-indexed requirements of {count} companies")
+        return count
+
+    @staticmethod
+    async def _index(companies) -> int:
+        async with DatabaseEngine().async_session_maker() as db_session:
+            async with db_session.begin():
+                for company in companies:
+                    await IndexCompanyRequirements(company).index(db_session)
+        return len(companies)
+
+
+if __name__ == "__main__":
+    asyncio.run(ReindexCompanyRequirements().reindex())
@@ -1,23 +1,39 @@
+import json
 from dataclasses import dataclass
 
+from src.actions.company.index_company_requirements import IndexCompanyRequirements
+from src.database.database_engine import DatabaseEngine
 from src.models.company import Company
-from src.repositories.company_repository import CompanyRepository
-from src.repositories.repository import Repository
+from src.repositories.async_repository import AsyncRepository
+from src.types.company_status import CompanyStatus
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
 
 
 @dataclass
 class UpsertCompany:
     session_id: str
     data: str
+    status: CompanyStatus = CompanyStatus.FINAL
 
-    def upsert(self) -> Company:
-        instance = Company(session_id=self.session_id, data=self.data)
+    async def upsert(self) -> Company:
         try:
-            company, _ = Repository(Company).create(instance)
-        except Exception:
-            company, _ = CompanyRepository(Company).read_by_session_id(
-                session_id=self.session_id
-            )
-            company.data = self.data
-            company, _ = Repository(Company).update(company)
+            data = json.loads(self.data)
+        except json.JSONDecodeError:
+            raise ServerException(ExceptionTypes.DATA_INVALID)
+        async with DatabaseEngine().async_session_maker() as db_session:
+            async with db_session.begin():
+                company, _ = await AsyncRepository(Company).upsert(
+                    Company(
+                        session_id=self.session_id,
+                        data=data,
+                        status=self.status.value,
+                    ),
+                    conflict_keys=["session_id"],
+                    session=db_session,
+                )
+                # keep the search index in step with the posting; drafts
+                # are not searchable yet
+                if self.status == CompanyStatus.FINAL:
+                    await IndexCompanyRequirements(company).index(db_session)
         return company
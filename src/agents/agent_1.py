@@ -1,31 +1,27 @@
+import asyncio
 from pylib_0xe.config.config import Config
 import openai
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessage
 import logging
 import json
-from typing import List, Dict, Any, Tuple
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
 
 # Pydantic for data validation
 from pydantic import BaseModel, Field, ValidationError
 
-LOGGER = logging.getLogger(__name__)
-
-# --- Configuration ---
-OPENAI_API_KEY = Config.read_env("openai_api_key")
-if not OPENAI_API_KEY:
-    raise ValueError(
-        "OPENAI_API_KEY not found in environment variables. Please set it in a .env file or directly."
-    )
+from src.caches.llm_response_cache import LlmResponseCache
+from src.agents.context_builder import ContextBuilder
+from src.agents.model_router import ModelRouter
+from src.agents.structured_output import strict_schema
+from src.mediators.llm_client_mediator import LlmClientMediator
+from src.types.exception_types import ExceptionTypes
+from src.types.route_types import RouteTypes
+from src.types.server_exception import ServerException
 
-BASE_URL = Config.read_env("base_url")
-if not BASE_URL:
-    raise ValueError(
-        "BASE_URL not found in environment variables. Please set it in a .env file or directly."
-    )
+LOGGER = logging.getLogger(__name__)
 
-LLM_MODEL = "gpt-4o-mini"  # Or a more capable model like "gpt-4o" or "gpt-4-turbo" for complex flows
-TEMPERATURE = (
-    0.3  # Lower temperature for more deterministic and instruction-following behavior
-)
+# Receives every streamed chunk of the assistant reply as soon as it arrives
+DeltaCallback = Callable[[str], Awaitable[None]]
 
 
 # --- Pydantic Models ---
@@ -53,8 +49,34 @@ class JobPostingOutput(BaseModel):
     )
 
 
+class JobPostingDraft(BaseModel):
+    """What the interview has established so far; filled in turn by turn."""
+
+    company_name: Optional[str] = Field(None, description="The name of the company.")
+    company_industry: Optional[str] = Field(
+        None, description="The industry of the company."
+    )
+    job_position: Optional[str] = Field(
+        None, description="The title of the job position."
+    )
+    general_responsibilities: Optional[str] = Field(
+        None,
+        description="General responsibilities of the role, kept as background only.",
+    )
+    requirements: List[StackDetail] = Field(
+        default_factory=list,
+        description="Every technology stack requirement collected so far.",
+    )
+
+    def to_output(self) -> JobPostingOutput:
+        """Raises ValidationError while a required field is still missing."""
+        return JobPostingOutput.model_validate(
+            self.model_dump(exclude={"general_responsibilities"})
+        )
+
+
 # --- System Prompt for Stack-Focused Job Posting Agent ---
-SYSTEM_PROMPT_STACK_FOCUS = f"""
+INTERVIEW_PROMPT = """
 Respond to the user in 'persian' language ('farsi') but keep the data storage in english.
 The assistant's role is to help define technical requirements for a job posting through a structured, conversational process.
 
@@ -73,7 +95,9 @@ After a technology/stack is named by the user for a given field, you MUST ask at
 This process of identifying a technology and then asking deep questions is repeated for all technologies within a field, and then for all identified fields.
 
 Again emphasize that assistant must ask about all fields identified.
+"""
 
+SYSTEM_PROMPT_STACK_FOCUS = INTERVIEW_PROMPT + f"""
 Once all necessary information is collected, the assistant outputs ONLY a single JSON object. This object must conform to the following structure:
 - "company_name": (string) The name of the company collected.
 - "company_industry": (string) The field of the company industry
@@ -114,6 +138,58 @@ Assistant must ask questions one by one and wait for user answers before proceed
 When the assistant believes it has gathered all necessary details for all fields and their technologies, it should directly output the final JSON object and must tell "FINISHED".
 """
 
+# The collected data is extracted into a draft after every turn, so the
+# interview no longer has to end by reproducing it as JSON.
+SYSTEM_PROMPT_STACK_FOCUS_DRAFT = INTERVIEW_PROMPT + """
+Assistant must ask questions one by one and wait for user answers before proceeding to the next question.
+The collected information is recorded separately, so the assistant never outputs JSON.
+When the assistant believes it has gathered all necessary details for all fields and their technologies, it briefly thanks the user and ends its message with the word "FINISHED".
+"""
+
+DRAFT_PROMPT = """
+You keep the structured draft of a job posting that an assistant collects from a user in an interview.
+You receive the current draft and the latest messages of the interview.
+Call the update_job_posting_draft function with the complete updated draft: keep everything from the current draft,
+add or correct what the user stated or confirmed in the latest messages, and leave unknown fields null.
+Store all values in english, even when the conversation is in persian.
+"""
+
+OUTPUT_PROMPT = """
+You turn a finished job-posting intake interview into the final job posting object.
+You receive the draft collected during the interview and the conversation itself; the conversation wins where they disagree.
+Include every technical field, stack and deep requirement the user gave, and store all values in english.
+"""
+
+FINISHED_MARKER = "FINISHED"
+
+PROMPT_VERSION = "stack_focus.v2"
+# the prompt of sessions created before the version was stored
+LEGACY_PROMPT_VERSION = "stack_focus.v1"
+# Sessions store only the version; the text is attached when a request is built
+SYSTEM_PROMPTS: Dict[str, str] = {
+    LEGACY_PROMPT_VERSION: SYSTEM_PROMPT_STACK_FOCUS,
+    PROMPT_VERSION: SYSTEM_PROMPT_STACK_FOCUS_DRAFT,
+}
+
+OUTPUT_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "job_posting_output",
+        "schema": strict_schema(JobPostingOutput),
+        "strict": True,
+    },
+}
+
+DRAFT_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "update_job_posting_draft",
+        "description": "Stores the complete updated draft of the job posting.",
+        "parameters": strict_schema(JobPostingDraft),
+        "strict": True,
+    },
+}
+
 
 class Agent:
     """
@@ -123,17 +199,30 @@ class Agent:
 
     def __init__(
         self,
-        base_url: str = BASE_URL,
-        api_key: str = OPENAI_API_KEY,
-        model: str = LLM_MODEL,
-        temperature: float = TEMPERATURE,
+        client: Optional[openai.AsyncOpenAI] = None,
+        prompt_version: str = PROMPT_VERSION,
     ):
-        self.client = openai.OpenAI(api_key=api_key, base_url=base_url)
-        self.model = model
-        self.temperature = temperature
-        self.messages: List[Dict[str, str]] = [
-            {"role": "system", "content": SYSTEM_PROMPT_STACK_FOCUS}
-        ]
+        # the client is shared process-wide; an Agent only holds conversation state
+        self.client = client or LlmClientMediator().client
+        # model, temperature, timeout and max_tokens are chosen per call
+        self.router = ModelRouter()
+        self.policy = LlmClientMediator().policy
+        self.cache = LlmResponseCache()
+        if prompt_version not in SYSTEM_PROMPTS:
+            raise ServerException(ExceptionTypes.PROMPT_VERSION_INVALID)
+        self.prompt_version = prompt_version
+        # the conversation only; the system prompt is attached per request
+        self.messages: List[Dict[str, str]] = []
+        # number of leading messages that are already stored in chat_messages
+        self.persisted_count = 0
+        # running summary of the first `summarized_count` messages
+        self.summary: Optional[str] = None
+        self.summarized_count = 0
+        self.context_builder = ContextBuilder(
+            model=self.router.route(RouteTypes.QUESTION).model,
+            max_prompt_tokens=Config.read("main.context.max_prompt_tokens"),
+            recent_tokens=Config.read("main.context.recent_tokens"),
+        )
         # Internal storage for all collected data
         self.collected_data: Dict[str, Any] = {
             "company_name": None,  # Will be filled by LLM in final JSON
@@ -142,143 +231,362 @@ class Agent:
             "general_job_requirements_context": None,  # For context, not in final JSON
             "final_job_posting_output": None,  # This will store the LLM's final JSON object (as Pydantic model)
         }
+        # updated after every turn; the final output is validated from it
+        self.draft: Optional[JobPostingDraft] = None
+        self.draft_changed = False
+        self.draft_merged = False
 
     def history(self) -> str:
         return json.dumps(self.messages)
 
-    def get_initial_greeting(self) -> str:
+    def request_messages(self) -> List[Dict[str, str]]:
+        messages = [{"role": "system", "content": SYSTEM_PROMPTS[self.prompt_version]}]
+        if self.summary:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"State of the conversation so far:\n{self.summary}",
+                }
+            )
+        return messages + self.messages[self.summarized_count :]
+
+    async def fit_context(self) -> None:
         """
-        Gets the initial greeting/first question from the LLM.
+        Folds the oldest turns into the running summary when the prompt would
+        exceed its token budget; on failure the full history is sent instead.
         """
+        pending = self.messages[self.summarized_count :]
+        fold = self.context_builder.overflow(
+            SYSTEM_PROMPTS[self.prompt_version], self.summary, pending
+        )
+        if not fold:
+            return
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=self.messages,  # type:ignore
-                temperature=self.temperature,
+            message = await self.message(
+                RouteTypes.SUMMARY,
+                messages=ContextBuilder.summary_request(self.summary, pending[:fold]),
+            )
+        except (openai.APIError, ServerException) as e:
+            LOGGER.warning(f"could not summarize the conversation: {e}")
+            return
+        summary = message.content
+        if summary:
+            self.summary = summary
+            self.summarized_count += fold
+
+    def load_draft(self, draft: Optional[JobPostingDraft]) -> None:
+        self.draft = draft
+        self.draft_changed = False
+        if draft:
+            self.collected_data.update(
+                company_name=draft.company_name,
+                job_position=draft.job_position,
+                company_industry=draft.company_industry,
+                general_job_requirements_context=draft.general_responsibilities,
             )
-            assistant_reply = response.choices[0].message.content
-            if assistant_reply:
-                self.messages.append({"role": "assistant", "content": assistant_reply})
-                return assistant_reply
-            else:
-                return "Error: LLM returned an empty initial response."
-        except openai.APIError as e:
-            print(f"OpenAI API Error: {e}")
-            return "Error: Could not connect to the AI. Please check your API key and network."
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            return "Error: An unexpected error occurred."
-
-    def load_messages(self, messages: str) -> None:
-        self.messages = json.loads(messages)
-
-    def shot(self, messages: str, user_message: str) -> Tuple[str, str, str]:
+
+    async def update_draft(self, messages: List[Dict[str, str]]) -> bool:
         """
-        response, messages, built_data
+        Merges what `messages` add into the draft. Without a draft yet, the
+        whole conversation is read; failures keep the previous draft and
+        return False.
         """
-        self.load_messages(messages)
-
+        if self.draft is None:
+            messages = self.messages
+        current = self.draft.model_dump_json() if self.draft else "(empty)"
+        transcript = "\n".join(
+            f"{message['role']}: {message['content']}" for message in messages
+        )
         try:
-            assistant_reply = self.process_user_response(user_message)
-            if assistant_reply:
-                self.messages.append({"role": "assistant", "content": assistant_reply})
-                return (
-                    assistant_reply,
-                    json.dumps(self.messages),
-                    (
-                        self.collected_data["final_job_posting_output"].model_dump_json(
-                            indent=2
-                        )
-                        if self.collected_data["final_job_posting_output"]
-                        else None
-                    ),  # type:ignore
+            message = await self.message(
+                RouteTypes.DRAFT,
+                messages=[
+                    {"role": "system", "content": DRAFT_PROMPT},
+                    {
+                        "role": "user",
+                        "content": f"Current draft:\n{current}\n\n"
+                        f"Latest messages:\n{transcript}",
+                    },
+                ],
+                tools=[DRAFT_TOOL],
+                tool_choice={
+                    "type": "function",
+                    "function": {"name": DRAFT_TOOL["function"]["name"]},
+                },
+            )
+            tool_calls = message.tool_calls
+            if not tool_calls:
+                LOGGER.warning("the model returned no job posting draft")
+                return False
+            draft = JobPostingDraft.model_validate_json(
+                tool_calls[0].function.arguments
+            )
+        except (openai.APIError, ServerException, ValidationError) as e:
+            LOGGER.warning(f"could not update the job posting draft: {e}")
+            return False
+        if draft != self.draft:
+            self.load_draft(draft)
+            self.draft_changed = True
+        return True
+
+    async def finalize(self) -> None:
+        """
+        Sets the final output once the interview ends: the draft when it
+        already validates, a schema-constrained extraction otherwise.
+        """
+        if self.draft is not None:
+            try:
+                self.collected_data["final_job_posting_output"] = self.draft.to_output()
+                return
+            except ValidationError as e:
+                LOGGER.info(f"the job posting draft is not complete: {e}")
+        self.collected_data["final_job_posting_output"] = await self.extract_output()
+
+    async def extract_output(self) -> Optional[JobPostingOutput]:
+        """
+        Generates the JobPostingOutput with the schema as response format.
+        A reply that still fails validation is sent back together with the
+        error, at most `structured_output.max_repairs` times.
+        """
+        current = self.draft.model_dump_json() if self.draft else "(empty)"
+        transcript = "\n".join(
+            f"{message['role']}: {message['content']}"
+            for message in self.messages[self.summarized_count :]
+        )
+        if self.summary:
+            transcript = f"(earlier) {self.summary}\n{transcript}"
+        messages = [
+            {"role": "system", "content": OUTPUT_PROMPT},
+            {
+                "role": "user",
+                "content": f"Draft:\n{current}\n\nConversation:\n{transcript}",
+            },
+        ]
+        for attempt in range(Config.read("main.structured_output.max_repairs") + 1):
+            route_type = RouteTypes.REPAIR if attempt else RouteTypes.EXTRACTION
+            try:
+                message = await self.message(
+                    route_type, messages=messages, response_format=OUTPUT_FORMAT
                 )
-            else:
-                raise Exception("Error: LLM returned an empty response.")
-        except openai.APIError as e:
-            print(f"OpenAI API Error: {e}")
-            raise Exception(
-                "Error: Could not process your response. Please check your API key and network."
+            except (openai.APIError, ServerException) as e:
+                LOGGER.warning(f"could not extract the job posting: {e}")
+                return None
+            content = message.content
+            if not content:
+                # a refusal; retrying the same request will not help
+                LOGGER.warning("the model returned no job posting")
+                return None
+            try:
+                return JobPostingOutput.model_validate_json(content)
+            except ValidationError as e:
+                LOGGER.info(f"repairing an invalid job posting: {e}")
+                messages += [
+                    {"role": "assistant", "content": content},
+                    {
+                        "role": "user",
+                        "content": f"The object failed validation:\n{e}\n"
+                        "Return the corrected object.",
+                    },
+                ]
+        LOGGER.warning("the job posting is still invalid after repairs")
+        return None
+
+    async def message(
+        self, route_type: RouteTypes, **kwargs: Any
+    ) -> ChatCompletionMessage:
+        """
+        The assistant message of a completion on the route's model, served
+        from the response cache when possible, else run under the call policy.
+        """
+        route = self.router.route(route_type)
+        options = route.options()
+        key, cached = await self.cache.get(route.cache, {**kwargs, **options})
+        if cached is not None:
+            return ChatCompletionMessage.model_validate(cached)
+        response = await self.policy.create(
+            route_type,
+            lambda: self.client.chat.completions.create(**kwargs, **options),
+        )
+        message = response.choices[0].message
+        if message.content or message.tool_calls:
+            await self.cache.put(
+                route_type, route.cache, key, message.model_dump(exclude_none=True)
             )
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            raise Exception("Error: An unexpected error occurred.")
+        return message
 
-        return "", "", ""
+    def new_messages(self) -> List[Dict[str, str]]:
+        """Messages added since the history was loaded, i.e. not yet persisted."""
+        return self.messages[self.persisted_count :]
 
-    def process_user_response(self, user_input: str) -> str:
+    async def complete(
+        self,
+        on_delta: Optional[DeltaCallback] = None,
+        route_type: RouteTypes = RouteTypes.QUESTION,
+    ) -> Optional[str]:
+        """
+        Sends the current history to the LLM and returns the assistant reply.
+        When `on_delta` is given, the completion is streamed and every chunk
+        is handed to it before the full reply is returned.
+        """
+        await self.fit_context()
+        messages = self.request_messages()
+        if on_delta is None:
+            return (await self.message(route_type, messages=messages)).content
+
+        route = self.router.route(route_type)
+        options = route.options()
+        key, cached = await self.cache.get(
+            route.cache, {"messages": messages, **options}
+        )
+        if cached is not None:
+            # a cached reply arrives as a single delta
+            await on_delta(cached["content"])
+            return cached["content"]
+
+        async def read(stream: openai.AsyncStream[ChatCompletionChunk]) -> str:
+            chunks: List[str] = []
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    await on_delta(delta)
+            return "".join(chunks)
+
+        # deltas reach the user as they arrive, so only opening the stream
+        # is retried
+        reply = await self.policy.stream(
+            route_type,
+            lambda: self.client.chat.completions.create(
+                messages=messages, stream=True, **options  # type:ignore
+            ),
+            read,
+        )
+        if reply:
+            await self.cache.put(
+                route_type, route.cache, key, {"role": "assistant", "content": reply}
+            )
+        return reply
+
+    async def get_initial_greeting(
+        self, on_delta: Optional[DeltaCallback] = None
+    ) -> str:
+        """
+        Gets the initial greeting/first question from the LLM.
+        Raises ServerException(LLM_UNAVAILABLE) when there is none.
+        """
+        assistant_reply = await self.complete(on_delta, RouteTypes.GREETING)
+        if not assistant_reply:
+            raise ServerException(
+                ExceptionTypes.LLM_UNAVAILABLE,
+                "LLM returned an empty initial response.",
+            )
+        self.messages.append({"role": "assistant", "content": assistant_reply})
+        return assistant_reply
+
+    def accept_greeting(self, greeting: str) -> None:
+        """Starts the conversation with an already generated greeting."""
+        self.messages.append({"role": "assistant", "content": greeting})
+
+    def load_messages(
+        self,
+        messages: List[Dict[str, str]],
+        summary: Optional[str] = None,
+        summarized_count: int = 0,
+    ) -> None:
+        self.messages = [message for message in messages if message["role"] != "system"]
+        self.persisted_count = len(self.messages)
+        self.summary = summary
+        self.summarized_count = min(summarized_count, len(self.messages))
+
+    async def shot(
+        self,
+        messages: List[Dict[str, str]],
+        user_messages: List[str],
+        on_delta: Optional[DeltaCallback] = None,
+        summary: Optional[str] = None,
+        summarized_count: int = 0,
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        response, new_messages
+
+        Several queued user messages are answered with a single completion;
+        blank ones are left out.
+        The draft is brought up to date afterwards, by `follow_up`.
+        """
+        self.load_messages(messages, summary, summarized_count)
+        # blank messages are dropped; only an all-blank batch gets the canned
+        # "Please provide a response." without an LLM call
+        *earlier_messages, user_message = [
+            message for message in user_messages if message.strip()
+        ] or user_messages[-1:]
+        for earlier_message in earlier_messages:
+            self.messages.append({"role": "user", "content": earlier_message})
+
+        assistant_reply = await self.process_user_response(user_message, on_delta)
+        self.messages.append({"role": "assistant", "content": assistant_reply})
+        return assistant_reply, self.new_messages()
+
+    async def follow_up(
+        self,
+        messages: List[Dict[str, str]],
+        turn_start: int,
+        summary: Optional[str] = None,
+        summarized_count: int = 0,
+        draft: Optional[JobPostingDraft] = None,
+    ) -> Optional[str]:
+        """
+        built_data
+
+        Merges the answered turns, `messages[turn_start:]`, into the draft;
+        `draft_merged` tells whether that worked. `built_data` is only set
+        once the interview is finished and a final output could be built.
+        """
+        self.load_messages(messages, summary, summarized_count)
+        self.load_draft(draft)
+        turns = self.messages[turn_start:]
+        self.draft_merged = await self.update_draft(turns)
+        if not any(
+            message["role"] == "assistant"
+            and (
+                FINISHED_MARKER in message["content"]
+                or is_potential_json_object(extract_json(message["content"]))
+            )
+            for message in turns
+        ):
+            return None
+        if self.draft_merged:
+            await self.finalize()
+        else:
+            # the draft misses the latest turns; it would validate without them
+            self.collected_data["final_job_posting_output"] = (
+                await self.extract_output()
+            )
+        output = self.collected_data["final_job_posting_output"]
+        return output.model_dump_json(indent=2) if output else None
+
+    async def process_user_response(
+        self, user_input: str, on_delta: Optional[DeltaCallback] = None
+    ) -> str:
         """
         Sends user input to the LLM, gets the next question or final JSON object,
-        and updates conversation history.
+        and updates conversation history. LLM failures raise ServerException
+        instead of being returned as the reply; the final output is built by
+        `finalize`.
         """
         if not user_input.strip():
             return "Please provide a response."
 
         self.messages.append({"role": "user", "content": user_input})
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=self.messages,  # type:ignore
-                temperature=self.temperature,
+        assistant_reply = await self.complete(on_delta)
+        if not assistant_reply:
+            raise ServerException(
+                ExceptionTypes.LLM_UNAVAILABLE, "LLM returned an empty response."
             )
-            assistant_reply = response.choices[0].message.content
-            if not assistant_reply:
-                raise Exception("Invalid output from LLM")
-
-            extracted = extract_json(assistant_reply)
-            if is_potential_json_object(extracted):  # Check for JSON object
-                LOGGER.info(
-                    "\n🔄 Validating collected job posting information against schema..."
-                )
-                try:
-                    # The LLM should output ONLY the JSON object string.
-                    raw_json_data = json.loads(extracted)
-
-                    # Validate the entire structure against JobPostingOutput
-                    validated_job_output = JobPostingOutput(**raw_json_data)
-                    self.collected_data["final_job_posting_output"] = (
-                        validated_job_output
-                    )
-
-                    print("\n✅ Successfully collected and validated job posting data!")
-                    print("\n--- Parsed Job Posting Data (Pydantic Model) ---")
-                    # Use Pydantic's model_dump_json for clean output
-                    output_json_str = validated_job_output.model_dump_json(indent=2)
-                    print(output_json_str)
-                    print("------------------------------------")
-                    # The agent's collected_data also holds the Pydantic model now.
-                    # agent.collected_data["company_name"] etc. are not directly updated here
-                    # as the final JSON from LLM is the source of truth for those.
-                except json.JSONDecodeError:
-                    print("\n❌ Error: Agent's final response was not valid JSON.")
-                    print(f"LLM Output: \n{assistant_reply}")
-                    print(
-                        "Agent: The final output was not valid JSON. Please ensure the AI is configured correctly or try again."
-                    )
-                except ValidationError as e:
-                    print(
-                        "\n❌ Error: Agent's final JSON object did not match the required JobPostingOutput schema."
-                    )
-                    print("Pydantic Validation Errors:")
-                    print(e)
-                    print(f"LLM Output: \n{assistant_reply}")
-                    print(
-                        "Agent: The final output's structure was incorrect. Please ensure the AI is configured correctly or try again."
-                    )
-                except (
-                    Exception
-                ) as e:  # Catch any other unexpected errors during validation
-                    print(f"\n❌ An unexpected error occurred during validation: {e}")
-                    print(f"LLM Output: \n{assistant_reply}")
-
-            return assistant_reply
-        except openai.APIError as e:
-            print(f"OpenAI API Error: {e}")
-            return "Error: Could not process your response. Please check your API key and network."
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            return "Error: An unexpected error occurred."
+
+        return assistant_reply
 
 
 def is_potential_json_object(text: str) -> bool:
@@ -298,23 +606,18 @@ def extract_json(text: str) -> str:
     return ""
 
 
-def main():
+async def main():
     print("🤖 AI Job Stacks Agent Initializing...\n")
-    # For this complex flow, a more capable model like "gpt-4o" or "gpt-4-turbo" is recommended.
-    print(BASE_URL)
-    print(OPENAI_API_KEY)
-    agent = Agent(
-        base_url=BASE_URL,
-        api_key=OPENAI_API_KEY,
-        model=LLM_MODEL,
-        temperature=TEMPERATURE,
-    )
-
-    assistant_reply = agent.get_initial_greeting()
-    print(f"Agent: {assistant_reply}")
-
-    if "Error:" in assistant_reply:
+    print(LlmClientMediator().base_url)
+    # models come from `main.models`; the CLI validates the final JSON reply itself
+    agent = Agent(prompt_version=LEGACY_PROMPT_VERSION)
+
+    try:
+        assistant_reply = await agent.get_initial_greeting()
+    except (openai.APIError, ServerException) as e:
+        print(f"Agent: Could not reach the AI ({e}).")
         return
+    print(f"Agent: {assistant_reply}")
 
     turn_count = 0
     # Max turns needs to be generous due to iterative stack questioning.
@@ -334,12 +637,14 @@ def main():
             print("Agent: Exiting conversation. Goodbye!")
             break
 
-        assistant_reply = agent.process_user_response(user_input)
-        print(f"\nAgent: {assistant_reply}")
-
-        if "Error:" in assistant_reply:
-            print("Agent: Encountered an error processing the response. Exiting.")
+        try:
+            assistant_reply = await agent.process_user_response(user_input)
+        except (openai.APIError, ServerException) as e:
+            print(
+                f"Agent: Encountered an error processing the response ({e}). Exiting."
+            )
             break
+        print(f"\nAgent: {assistant_reply}")
 
         if is_potential_json_object(assistant_reply):  # Check for JSON object
             print("\n🔄 Validating collected job posting information against schema...")
@@ -399,4 +704,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+import httpx
+import openai
+
+from src.agents.circuit_breaker import CircuitBreaker
+from src.types.api.call_policy_stats import CallPolicyStats
+from src.types.exception_types import ExceptionTypes
+from src.types.route_types import RouteTypes
+from src.types.server_exception import ServerException
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# throttling, provider errors, timeouts and dropped connections; other API
+# errors are caused by the request itself and are raised right away
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,
+)
+
+
+class CallPolicy:
+    """
+    Wraps every LLM request: an overall deadline, retries with exponential
+    backoff and full jitter on retryable errors, a hedged second request once
+    a call outlives the route's p95 latency, and a circuit breaker shared by
+    all routes. Failures surface as `LLM_UNAVAILABLE` with a retry-after.
+    The process-wide instance is owned by `LlmClientMediator`.
+    """
+
+    def __init__(
+        self,
+        deadline: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        hedge: bool,
+        hedge_min_samples: int,
+        hedge_window: int,
+        failure_threshold: int,
+        reset_timeout: float,
+    ) -> None:
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = CircuitBreaker(
+            failure_threshold=failure_threshold, reset_timeout=reset_timeout
+        )
+        self.latencies: Dict[RouteTypes, Deque[float]] = {
+            route_type: deque(maxlen=hedge_window) for route_type in RouteTypes
+        }
+        self.calls = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.rejected = 0
+
+    async def create(
+        self,
+        route_type: RouteTypes,
+        request: Callable[[], Awaitable[T]],
+        hedge: bool = True,
+        deadline: Optional[float] = None,
+    ) -> T:
+        """
+        Runs `request` under the policy, to be done by `deadline` (monotonic;
+        the policy's deadline from now by default).
+        """
+        self.calls += 1
+        deadline = deadline or time.monotonic() + self.deadline
+        for attempt in range(self.max_attempts):
+            if not self.breaker.allow():
+                self.rejected += 1
+                raise ServerException(
+                    ExceptionTypes.LLM_UNAVAILABLE,
+                    retry_after=self.breaker.retry_after(),
+                )
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    self._attempt(route_type, request, hedge),
+                    deadline - started,
+                )
+            except asyncio.TimeoutError:
+                self.breaker.failure()
+                self.failed += 1
+                raise ServerException(
+                    ExceptionTypes.LLM_UNAVAILABLE,
+                    retry_after=self._retry_after(self.backoff_base),
+                )
+            except RETRYABLE_ERRORS as e:
+                self.breaker.failure()
+                delay = self._backoff(attempt, e)
+                if (
+                    attempt + 1 == self.max_attempts
+                    or time.monotonic() + delay >= deadline
+                ):
+                    self.failed += 1
+                    raise ServerException(
+                        ExceptionTypes.LLM_UNAVAILABLE,
+                        retry_after=self._retry_after(delay),
+                    ) from e
+                self.retries += 1
+                LOGGER.warning(
+                    f"{route_type.value} call failed ({e}), retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            except openai.APIError as e:
+                # the provider answered, the request was wrong
+                self.breaker.success()
+                self.failed += 1
+                raise ServerException(
+                    ExceptionTypes.LLM_UNAVAILABLE,
+                    detail=e.message,
+                    retry_after=self._retry_after(self.backoff_base),
+                ) from e
+            except asyncio.CancelledError:
+                self.breaker.abandon()
+                raise
+            self.breaker.success()
+            self.succeeded += 1
+            self.latencies[route_type].append(time.monotonic() - started)
+            return result
+        raise AssertionError("unreachable")
+
+    async def stream(
+        self,
+        route_type: RouteTypes,
+        request: Callable[[], Awaitable[openai.AsyncStream[T]]],
+        read: Callable[[openai.AsyncStream[T]], Awaitable[R]],
+    ) -> R:
+        """
+        Opens a stream under the policy and `read`s it within the same
+        deadline. Only opening is retried, and never hedged, as chunks may
+        already have been passed on; a failed read is a failed call.
+        """
+        deadline = time.monotonic() + self.deadline
+        stream = await self.create(route_type, request, hedge=False, deadline=deadline)
+        try:
+            return await asyncio.wait_for(read(stream), deadline - time.monotonic())
+        except (asyncio.TimeoutError, openai.APIError, httpx.HTTPError) as e:
+            self.breaker.failure()
+            # opening the stream was counted as a success
+            self.succeeded -= 1
+            self.failed += 1
+            raise ServerException(
+                ExceptionTypes.LLM_UNAVAILABLE,
+                retry_after=self._retry_after(self.backoff_base),
+            ) from e
+        finally:
+            await stream.close()
+
+    def stats(self) -> CallPolicyStats:
+        return CallPolicyStats(
+            calls=self.calls,
+            succeeded=self.succeeded,
+            failed=self.failed,
+            retries=self.retries,
+            hedged=self.hedged,
+            hedge_wins=self.hedge_wins,
+            rejected=self.rejected,
+            circuit_state=self.breaker.state,
+            circuit_opened=self.breaker.times_opened,
+            retry_after=self.breaker.retry_after(),
+            p95_seconds={
+                route_type.value: self._p95(route_type) for route_type in RouteTypes
+            },
+        )
+
+    async def _attempt(
+        self,
+        route_type: RouteTypes,
+        request: Callable[[], Awaitable[T]],
+        hedge: bool,
+    ) -> T:
+        hedge_after = self._p95(route_type) if hedge and self.hedge else None
+        tasks: List[asyncio.Future] = [asyncio.ensure_future(request())]
+        try:
+            if hedge_after is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                if not done:
+                    self.hedged += 1
+                    tasks.append(asyncio.ensure_future(request()))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error  # type:ignore
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _p95(self, route_type: RouteTypes) -> Optional[float]:
+        latencies = self.latencies[route_type]
+        if len(latencies) < self.hedge_min_samples:
+            return None
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        if isinstance(error, openai.RateLimitError):
+            # the provider knows best when its quota frees up
+            retry_after = error.response.headers.get("retry-after")
+            if retry_after and _is_number(retry_after):
+                delay = max(delay, float(retry_after))
+        return delay
+
+    def _retry_after(self, delay: float) -> int:
+        return max(math.ceil(delay), self.breaker.retry_after(), 1)
+
+
+def _is_number(value: Any) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,60 @@
+import math
+import time
+from typing import Optional
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive provider failures so calls
+    fail fast instead of piling up; after `reset_timeout` seconds a single
+    trial call is let through and its outcome closes or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.trial or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.trial or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self.trial = True
+        return True
+
+    def retry_after(self) -> int:
+        """Seconds until a call is let through again; 0 when closed."""
+        if self.opened_at is None:
+            return 0
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        return max(math.ceil(remaining), 1)
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.trial or (
+            self.opened_at is None and self.failures >= self.failure_threshold
+        ):
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+        self.trial = False
+
+    def abandon(self) -> None:
+        """A trial call was cancelled before it had an outcome."""
+        self.trial = False
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.agents.token_counter import count_message_tokens
+
+SUMMARY_PROMPT = """
+You maintain the running state of a job-posting intake interview between an assistant and a user.
+Merge the previous state with the new part of the conversation and return the updated state.
+Keep, in English and as a compact list: company name, company industry, job position, general responsibilities,
+every technical field with its stacks and the deep requirements collected so far, and which fields or stacks
+still have to be asked about. Drop greetings and small talk. Output only the state.
+"""
+
+
+@dataclass
+class ContextBuilder:
+    """
+    Keeps the prompt of a conversation within `max_prompt_tokens`: the system
+    prompt and the latest `recent_tokens` worth of turns are sent verbatim,
+    older turns are folded into a running summary.
+    """
+
+    model: str
+    max_prompt_tokens: int
+    recent_tokens: int
+
+    def overflow(
+        self,
+        system_prompt: str,
+        summary: Optional[str],
+        messages: List[Dict[str, str]],
+    ) -> int:
+        """
+        Number of leading `messages` to fold into the summary so the prompt
+        fits; 0 when everything fits as it is.
+        """
+        fixed = [{"role": "system", "content": system_prompt}]
+        if summary:
+            fixed.append({"role": "system", "content": summary})
+        if count_message_tokens(fixed + messages, self.model) <= self.max_prompt_tokens:
+            return 0
+        kept, start = 0, len(messages)
+        # keep at least the last message, then as many as the recent budget allows
+        while start > 0:
+            size = count_message_tokens([messages[start - 1]], self.model)
+            if kept and kept + size > self.recent_tokens:
+                break
+            kept += size
+            start -= 1
+        return start
+
+    @staticmethod
+    def summary_request(
+        summary: Optional[str], messages: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        transcript = "\n".join(
+            f"{message['role']}: {message['content']}" for message in messages
+        )
+        return [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {
+                "role": "user",
+                "content": f"Previous state:\n{summary or '(empty)'}\n\n"
+                f"New conversation:\n{transcript}",
+            },
+        ]
@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from pylib_0xe.config.config import Config
+from pylib_0xe.decorators.singleton import singleton
+
+from src.types.route_types import RouteTypes
+
+
+@dataclass
+class ModelRoute:
+    model: str
+    temperature: float
+    # seconds, per request
+    timeout: float
+    max_tokens: Optional[int] = None
+    # whether answers on this route may come from the LlmResponseCache
+    cache: bool = True
+
+    def options(self) -> Dict[str, Any]:
+        """Keyword arguments for `chat.completions.create`."""
+        options: Dict[str, Any] = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "timeout": self.timeout,
+        }
+        if self.max_tokens:
+            options["max_tokens"] = self.max_tokens
+        return options
+
+
+@singleton
+class ModelRouter:
+    """
+    Picks the model of every LLM call by its route in `main.models`, so the
+    frequent interview turns run on a small model and the final extraction
+    on a stronger one.
+    """
+
+    def __init__(self) -> None:
+        self.routes: Dict[RouteTypes, ModelRoute] = {
+            route_type: ModelRoute(**Config.read(f"main.models.{route_type.value}"))
+            for route_type in RouteTypes
+        }
+
+    def route(self, route_type: RouteTypes) -> ModelRoute:
+        return self.routes[route_type]
+
+    def options(self, route_type: RouteTypes) -> Dict[str, Any]:
+        return self.route(route_type).options()
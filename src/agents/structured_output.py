@@ -0,0 +1,32 @@
+import copy
+from typing import Any, Dict, Type
+from pydantic import BaseModel
+
+
+def strict_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    The JSON schema of `model` in the subset strict structured output accepts:
+    every property required, no additional properties and no defaults.
+    Optional fields stay nullable, so the model answers `null` instead.
+    """
+    return _strict(copy.deepcopy(model.model_json_schema()))
+
+
+def _strict(schema: Any) -> Any:
+    if isinstance(schema, list):
+        return [_strict(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    schema.pop("default", None)
+    schema.pop("title", None)
+    if schema.get("type") == "object" and "properties" in schema:
+        schema["required"] = list(schema["properties"])
+        schema["additionalProperties"] = False
+    for key, value in schema.items():
+        if key == "properties":
+            schema[key] = {name: _strict(item) for name, item in value.items()}
+        elif key == "$defs":
+            schema[key] = {name: _strict(item) for name, item in value.items()}
+        elif isinstance(value, (dict, list)):
+            schema[key] = _strict(value)
+    return schema
@@ -0,0 +1,36 @@
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - counting falls back to an estimate
+    tiktoken = None
+
+# role, separators and priming tokens the chat format adds around a message
+MESSAGE_OVERHEAD = 4
+
+
+@lru_cache(maxsize=32)
+def _encoding(model: str) -> Optional["tiktoken.Encoding"]:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(content: str, model: str) -> int:
+    """Token count of `content`, cached per (content, model)."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(content) // 4 + 1
+    return len(encoding.encode(content))
+
+
+def count_message_tokens(messages: List[Dict[str, str]], model: str) -> int:
+    return sum(
+        count_tokens(message["content"], model) + MESSAGE_OVERHEAD
+        for message in messages
+    )
@@ -1,21 +1,45 @@
 import asyncio
+import json
 from contextlib import asynccontextmanager
-from fastapi import APIRouter, Body, FastAPI
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, FastAPI, Header, Response
+from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
+from src.agents.agent_1 import PROMPT_VERSION, Agent as Agent1
+from src.caches.greeting_cache import GreetingCache
+from src.caches.idempotency_store import IdempotencyStore
+from src.caches.llm_response_cache import LlmResponseCache
+from src.mediators.llm_client_mediator import LlmClientMediator
 from src.mediators.message_queue_mediator import MessageQueueMediator
+from src.actions.chat_session.read_chat_history import ReadChatHistory
 from src.actions.chat_session.update_chat_session import UpdateChatSession
+from src.api.rate_limits import limit_client, limit_session
 from src.orchestrators.agent_orchestrator import AgentOrchestrator
+from src.orchestrators.rate_limiter import RateLimiter
 from src.models.chat_session import ChatSession
-from src.repositories.repository import Repository
+from src.repositories.async_repository import AsyncRepository
+from src.repositories.chat_session_repository import ChatSessionRepository
+from src.types.api.agent_scheduler_stats import AgentSchedulerStats
+from src.types.api.call_policy_stats import CallPolicyStats
+from src.types.api.idempotency_stats import IdempotencyStats
+from src.types.api.rate_limit_stats import RateLimitStats
+from src.types.api.llm_cache_stats import LlmCacheStats
 from src.types.api.masked_chat_session import MaskedChatSession
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # initialize
-    AgentOrchestrator()
+    LlmClientMediator().open()
+    await MessageQueueMediator().start()
+    AgentOrchestrator().start()
+    GreetingCache().refresh(GreetingCache.key(Agent1()))
     yield
     # cleanup
+    await AgentOrchestrator().shutdown()
+    await GreetingCache().close()
+    await MessageQueueMediator().stop()
+    await LlmClientMediator().close()
 
 
 router = APIRouter(
@@ -25,50 +49,124 @@ router = APIRouter(
 )
 
 
-@router.get("/create")
+@router.get("/create", dependencies=[Depends(limit_client)])
 async def create() -> MaskedChatSession:
-    chat_session, _ = Repository(ChatSession).create(ChatSession())
-    asyncio.create_task(
-        AgentOrchestrator().dispatch_greetings(session_id=chat_session.id)
+    AgentOrchestrator().scheduler.check_capacity()
+    chat_session, _ = await AsyncRepository(ChatSession).create(
+        ChatSession(prompt_version=PROMPT_VERSION)
+    )
+    AgentOrchestrator().submit_greetings(
+        session_id=chat_session.id, prompt_version=PROMPT_VERSION
     )
     return MaskedChatSession(**chat_session.to_dict())
 
 
 @router.post("/update/{session_id}")
 async def update(session_id: str, messages: str = Body(...)) -> MaskedChatSession:
-    return MaskedChatSession(
-        **UpdateChatSession(session_id, messages).update().to_dict()
-    )
+    chat_session = await UpdateChatSession(session_id, messages).update()
+    return MaskedChatSession(**{**chat_session.to_dict(), "messages": messages})
 
 
 @router.get("/read/{session_id}")
 async def read_chat(session_id: str) -> MaskedChatSession:
-    chat_session, _ = Repository(ChatSession).read_by_id(session_id)
-    return MaskedChatSession(**chat_session.to_dict())
+    chat_session, _ = await AsyncRepository(ChatSession).read_by_id(session_id)
+    messages, _ = await ReadChatHistory(chat_session).read()
+    return MaskedChatSession(
+        **{**chat_session.to_dict(), "messages": json.dumps(messages)}
+    )
 
 
-@router.post("/update/{session_id}/user-message")
-async def user_message(session_id: str, message: str = Body(...)) -> str:
-    asyncio.create_task(
-        AgentOrchestrator().dispatch_query(session_id=session_id, user_message=message)
-    )
+@router.post(
+    "/update/{session_id}/user-message",
+    dependencies=[Depends(limit_client)],
+)
+async def user_message(
+    session_id: str,
+    response: Response,
+    message: str = Body(...),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    client_message_id: Optional[str] = None,
+) -> str:
+    """
+    A retry carrying the same `Idempotency-Key` header (or `client_message_id`)
+    gets the original result back without another agent turn; it does not
+    count against the session's rate limit.
+    """
+    key = idempotency_key or client_message_id
+    if key:
+        key = f"{session_id}:{key}"
+        accepted = await IdempotencyStore().claim(key)
+        if accepted is not None:
+            response.headers["Idempotent-Replayed"] = "true"
+            return accepted
+    try:
+        await limit_session(session_id)
+        AgentOrchestrator().submit_query(session_id=session_id, user_message=message)
+    except BaseException:
+        if key:
+            IdempotencyStore().release(key)
+        raise
+    if key:
+        IdempotencyStore().put(key, message)
     return message
 
 
+@router.get("/export")
+async def export() -> StreamingResponse:
+    """Every chat session with its messages as NDJSON, streamed."""
+
+    async def lines():
+        async for chat_session, messages in ChatSessionRepository(
+            ChatSession
+        ).stream_with_messages():
+            yield MaskedChatSession(
+                **{**chat_session.to_dict(), "messages": json.dumps(messages)}
+            ).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/stats")
+async def stats() -> AgentSchedulerStats:
+    return AgentOrchestrator().scheduler.stats()
+
+
+@router.get("/stats/llm")
+async def llm_stats() -> CallPolicyStats:
+    return LlmClientMediator().policy.stats()
+
+
+@router.get("/stats/cache")
+async def cache_stats() -> LlmCacheStats:
+    return LlmResponseCache().stats()
+
+
+@router.get("/stats/idempotency")
+async def idempotency_stats() -> IdempotencyStats:
+    return IdempotencyStore().stats()
+
+
+@router.get("/stats/rate-limits")
+async def rate_limit_stats() -> RateLimitStats:
+    return RateLimiter().stats()
+
+
 @router.get("/events/{session_id}")
-async def sse(session_id: str):
-    queue = asyncio.Queue()
-    MessageQueueMediator().mq[session_id] = queue
+async def sse(
+    session_id: str, last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    queue = MessageQueueMediator().subscribe(
+        session_id,
+        int(last_event_id) if last_event_id and last_event_id.isdigit() else None,
+    )
 
     async def event_generator():
         try:
             while True:
-                data = await queue.get()
-                if data == "FINISHED":
-                    raise asyncio.CancelledError()
-                yield {"event": "message", "data": data}
+                # the stream stays open until the client disconnects
+                yield await queue.get()
         except asyncio.CancelledError:
-            del MessageQueueMediator().mq[session_id]
+            MessageQueueMediator().unsubscribe(session_id, queue)
             raise
 
     return EventSourceResponse(event_generator())
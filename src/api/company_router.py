@@ -1,11 +1,24 @@
 from contextlib import asynccontextmanager
-from typing import List
-from fastapi import APIRouter, Body, FastAPI
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Body, FastAPI, Query, Response
+from fastapi.responses import StreamingResponse
+from pylib_0xe.config.config import Config
 
 from src.actions.company.upsert_company import UpsertCompany
 from src.models.company import Company
-from src.repositories.repository import Repository
+from src.models.company_requirement import CompanyRequirement
+from src.repositories.async_repository import AsyncRepository
+from src.repositories.company_repository import CompanyRepository
+from src.repositories.company_requirement_repository import (
+    CompanyRequirementRepository,
+)
+from src.types.api.field_facet import FieldFacet
+from src.types.api.stack_facet import StackFacet
+from src.types.api.term_facet import TermFacet
 from src.types.api.masked_company import MaskedCompany
+from src.types.api.page_cursor import PageCursor
+from src.types.company_status import CompanyStatus
 
 
 @asynccontextmanager
@@ -23,11 +36,130 @@ router = APIRouter(
 
 
 @router.get("/read")
-async def read() -> List[MaskedCompany]:
-    companies, _ = Repository(Company).read()
+async def read(
+    response: Response,
+    limit: int = Query(
+        Config.read("main.pagination.default_limit"),
+        ge=1,
+        le=Config.read("main.pagination.max_limit"),
+    ),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    order_by: Literal["created_at", "updated_at"] = "created_at",
+    include_data: bool = True,
+    company_industry: Optional[str] = None,
+    job_position: Optional[str] = None,
+    stack_name: Optional[str] = None,
+    stack_field: Optional[str] = None,
+    status: CompanyStatus = CompanyStatus.FINAL,
+) -> List[MaskedCompany]:
+    """
+    One page of companies; the cursor for the next page, if any, is sent in
+    the `X-Next-Cursor` header. The optional filters run inside Postgres.
+    Drafts of ongoing interviews are listed with `status=draft`.
+    """
+    filters = [CompanyRepository.with_status(status)]
+    if company_industry:
+        filters.append(CompanyRepository.in_industry(company_industry))
+    if job_position:
+        filters.append(CompanyRepository.for_job_position(job_position))
+    if stack_name:
+        filters.append(CompanyRepository.requires_stack(stack_name, stack_field))
+    companies, _ = await CompanyRepository(Company).read(
+        limit=limit,
+        cursor=PageCursor.decode(cursor) if cursor else None,
+        since=since,
+        order_by=order_by,
+        exclude=set() if include_data else {"data"},
+        filters=filters,
+    )
+    if len(companies) == limit:
+        last = companies[-1]
+        response.headers["X-Next-Cursor"] = PageCursor(
+            timestamp=getattr(last, order_by), id=last.id
+        ).encode()
+    return [MaskedCompany(**company.to_dict()) for company in companies]
+
+
+@router.get("/search")
+async def search(
+    response: Response,
+    stack_name: str,
+    stack_field: Optional[str] = None,
+    limit: int = Query(
+        Config.read("main.pagination.default_limit"),
+        ge=1,
+        le=Config.read("main.pagination.max_limit"),
+    ),
+    cursor: Optional[str] = None,
+    include_data: bool = True,
+) -> List[MaskedCompany]:
+    """Final companies requiring a stack, paginated like `/read`."""
+    companies, _ = await AsyncRepository(Company).read(
+        limit=limit,
+        cursor=PageCursor.decode(cursor) if cursor else None,
+        exclude=set() if include_data else {"data"},
+        filters=[
+            CompanyRepository.with_status(CompanyStatus.FINAL),
+            CompanyRequirementRepository.has_stack(stack_name, stack_field),
+        ],
+    )
+    if len(companies) == limit:
+        last = companies[-1]
+        response.headers["X-Next-Cursor"] = PageCursor(
+            timestamp=last.created_at, id=last.id
+        ).encode()
     return [MaskedCompany(**company.to_dict()) for company in companies]
 
 
+@router.get("/search/facets/fields")
+async def field_facets(limit: int = Query(50, ge=1, le=1000)) -> List[FieldFacet]:
+    facets, _ = await CompanyRequirementRepository(CompanyRequirement).field_facets(
+        limit=limit
+    )
+    return facets
+
+
+@router.get("/search/facets/stacks")
+async def stack_facets(
+    stack_field: Optional[str] = None, limit: int = Query(10, ge=1, le=1000)
+) -> List[StackFacet]:
+    """The most required stacks per field."""
+    facets, _ = await CompanyRequirementRepository(CompanyRequirement).stack_facets(
+        limit=limit, stack_field=stack_field
+    )
+    return facets
+
+
+@router.get("/search/facets/terms")
+async def term_facets(
+    stack_name: str,
+    stack_field: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=1000),
+) -> List[TermFacet]:
+    """The most asked deep requirements of a stack."""
+    facets, _ = await CompanyRequirementRepository(CompanyRequirement).term_facets(
+        stack_name=stack_name, limit=limit, stack_field=stack_field
+    )
+    return facets
+
+
+@router.get("/export")
+async def export(
+    include_data: bool = True, status: CompanyStatus = CompanyStatus.FINAL
+) -> StreamingResponse:
+    """Every company as NDJSON, streamed from a server-side cursor."""
+
+    async def lines():
+        async for company in AsyncRepository(Company).stream(
+            exclude=set() if include_data else {"data"},
+            filters=[CompanyRepository.with_status(status)],
+        ):
+            yield MaskedCompany(**company.to_dict()).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/create")
 async def upsert(session_id: str, data: str = Body(...)) -> MaskedCompany:
-    return MaskedCompany(**UpsertCompany(session_id, data).upsert().to_dict())
+    return MaskedCompany(**(await UpsertCompany(session_id, data).upsert()).to_dict())
@@ -0,0 +1,27 @@
+from fastapi import Request
+from pylib_0xe.config.config import Config
+
+from src.orchestrators.rate_limiter import RateLimiter
+from src.types.rate_limit_scopes import RateLimitScopes
+
+
+def client_address(request: Request) -> str:
+    if Config.read("main.rate_limit.trust_forwarded_for"):
+        # only behind a proxy that sets the header; clients can forge it
+        forwarded_for = request.headers.get("X-Forwarded-For")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def limit_client(request: Request) -> None:
+    """Route dependency: one token from the caller's client bucket."""
+    await RateLimiter().acquire(RateLimitScopes.CLIENT, client_address(request))
+
+
+async def limit_session(session_id: str) -> None:
+    """
+    One token from the bucket of the path's session. Routes call it after
+    ruling out idempotent replays, so retries do not use up the session's turns.
+    """
+    await RateLimiter().acquire(RateLimitScopes.SESSION, session_id)
@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 from pylib_0xe.config.config import Config
 from fastapi import APIRouter, FastAPI
 
+from src.database.database_engine import DatabaseEngine
 from src.orchestrators.initialize import Initialize
 from .company_router import router as company_router
 from .chat_router import router as chatbot_router
@@ -20,6 +21,7 @@ async def lifespan(app: FastAPI):
     yield
     # cleanup
     LOGGER.info(f"Cleanup")
+    await DatabaseEngine().async_engine.dispose()
 
 
 router = APIRouter(
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from pylib_0xe.config.config import Config
+from pylib_0xe.decorators.singleton import singleton
+
+from src.agents.agent_1 import Agent
+from src.agents.model_router import ModelRouter
+from src.types.route_types import RouteTypes
+
+LOGGER = logging.getLogger(__name__)
+
+# (prompt version, model, temperature)
+GreetingKey = Tuple[str, str, float]
+
+
+@dataclass
+class CachedGreeting:
+    content: str
+    created_at: float
+
+
+@singleton
+class GreetingCache:
+    """
+    Keeps a small pool of pre-generated first messages per prompt/model so
+    new sessions can be greeted without an LLM round trip. Pools are refilled
+    in the background and entries expire after `main.greetings.ttl` seconds.
+    """
+
+    def __init__(self) -> None:
+        self.pool_size: int = Config.read("main.greetings.pool_size")
+        self.ttl: float = Config.read("main.greetings.ttl")
+        self.pools: Dict[GreetingKey, List[CachedGreeting]] = {}
+        self.tasks: Dict[GreetingKey, asyncio.Task] = {}
+
+    @staticmethod
+    def key(agent: Agent) -> GreetingKey:
+        route = ModelRouter().route(RouteTypes.GREETING)
+        return agent.prompt_version, route.model, route.temperature
+
+    def get(self, agent: Agent) -> Optional[str]:
+        """Returns a cached greeting, or None on a miss; refills in background."""
+        key = self.key(agent)
+        pool = self._fresh(key)
+        if len(pool) < self.pool_size:
+            self.refresh(key)
+        if not pool:
+            return None
+        return random.choice(pool).content
+
+    def add(self, agent: Agent, greeting: str) -> None:
+        pool = self._fresh(self.key(agent))
+        if len(pool) < self.pool_size:
+            pool.append(CachedGreeting(greeting, time.monotonic()))
+
+    def refresh(self, key: GreetingKey) -> None:
+        task = self.tasks.get(key)
+        if task and not task.done():
+            return
+        self.tasks[key] = asyncio.create_task(self._fill(key))
+
+    async def close(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.tasks.clear()
+
+    def _fresh(self, key: GreetingKey) -> List[CachedGreeting]:
+        now = time.monotonic()
+        pool = [
+            greeting
+            for greeting in self.pools.get(key, [])
+            if now - greeting.created_at < self.ttl
+        ]
+        self.pools[key] = pool
+        return pool
+
+    async def _fill(self, key: GreetingKey) -> None:
+        prompt_version, _, _ = key
+        while len(self._fresh(key)) < self.pool_size:
+            agent = Agent(prompt_version=prompt_version)
+            try:
+                greeting = await agent.complete(route_type=RouteTypes.GREETING)
+            except Exception as e:
+                LOGGER.warning(f"could not refill greetings for {key}: {e}")
+                return
+            if not greeting:
+                return
+            self.add(agent, greeting)
+        LOGGER.info(f"greeting pool for {key} is full")
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from pylib_0xe.config.config import Config
+from pylib_0xe.decorators.singleton import singleton
+
+from src.types.api.idempotency_stats import IdempotencyStats
+
+
+@singleton
+class IdempotencyStore:
+    """
+    Remembers the result of accepted requests by their idempotency key for
+    `main.idempotency.ttl` seconds, so a retried request is answered with
+    the original result instead of scheduling the work again. A key is
+    claimed before the work starts, so concurrent retries wait for the first
+    request instead of racing it.
+    """
+
+    def __init__(self) -> None:
+        self.ttl: float = Config.read("main.idempotency.ttl")
+        self.max_keys: int = Config.read("main.idempotency.max_keys")
+        self.results: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        # claimed keys whose request is still running; resolves to its result,
+        # or to None when it failed
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.accepted = 0
+        self.deduplicated = 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.results.get(key)
+        if entry is None:
+            return None
+        result, stored_at = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self.results[key]
+            return None
+        self.deduplicated += 1
+        return result
+
+    async def claim(self, key: str) -> Optional[str]:
+        """
+        The stored result of `key`, or None once the caller holds the key and
+        has to `put` or `release` it. Checking and claiming do not await, so
+        of concurrent requests exactly one gets the claim.
+        """
+        while True:
+            result = self.get(key)
+            if result is not None:
+                return result
+            pending = self.pending.get(key)
+            if pending is None:
+                self.pending[key] = asyncio.get_running_loop().create_future()
+                return None
+            # the result, or another try at the claim when that request failed
+            await asyncio.shield(pending)
+
+    def release(self, key: str) -> None:
+        """Gives up a claim whose request failed; a waiting retry takes it over."""
+        pending = self.pending.pop(key, None)
+        if pending is not None and not pending.done():
+            pending.set_result(None)
+
+    def put(self, key: str, result: str) -> None:
+        self.accepted += 1
+        self.results[key] = (result, time.monotonic())
+        self.results.move_to_end(key)
+        # entries are added in time order, so the oldest expire first
+        while self.results:
+            oldest, (_, stored_at) = next(iter(self.results.items()))
+            if (
+                len(self.results) <= self.max_keys
+                and time.monotonic() - stored_at < self.ttl
+            ):
+                break
+            del self.results[oldest]
+        pending = self.pending.pop(key, None)
+        if pending is not None and not pending.done():
+            pending.set_result(result)
+
+    def stats(self) -> IdempotencyStats:
+        return IdempotencyStats(
+            size=len(self.results),
+            accepted=self.accepted,
+            deduplicated=self.deduplicated,
+        )
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+from pylib_0xe.config.config import Config
+from pylib_0xe.decorators.singleton import singleton
+from pylib_0xe.utils.time.get_current_time import GetCurrentTime
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.database_engine import DatabaseEngine
+from src.models.llm_response import LlmResponse
+from src.types.api.llm_cache_stats import LlmCacheStats
+from src.types.route_types import RouteTypes
+
+LOGGER = logging.getLogger(__name__)
+
+# request options that do not change what the model answers
+IGNORED_OPTIONS = {"timeout", "stream"}
+
+
+@singleton
+class LlmResponseCache:
+    """
+    Exact-match cache of assistant messages, keyed on a hash of the model,
+    its sampling options and the normalized message list. An in-process LRU
+    sits in front of an optional `llm_responses` table; both expire entries
+    after `main.llm_cache.ttl` seconds. Routes opt out with `cache: false`.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = Config.read("main.llm_cache.enabled")
+        self.backend: str = Config.read("main.llm_cache.backend")
+        self.ttl: float = Config.read("main.llm_cache.ttl")
+        self.capacity: int = Config.read("main.llm_cache.memory_size")
+        self.max_rows: int = Config.read("main.llm_cache.max_rows")
+        self.evict_every: int = Config.read("main.llm_cache.evict_every")
+        self.entries: OrderedDict[str, Tuple[Dict[str, Any], float]] = OrderedDict()
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.writes = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(request: Dict[str, Any]) -> str:
+        normalized = {
+            name: value
+            for name, value in request.items()
+            if name not in IGNORED_OPTIONS
+        }
+        normalized["messages"] = [
+            {
+                "role": message["role"],
+                # whitespace differences do not make a different question
+                "content": " ".join(str(message.get("content") or "").split()),
+            }
+            for message in request["messages"]
+        ]
+        return hashlib.sha256(
+            json.dumps(normalized, sort_keys=True, ensure_ascii=False).encode()
+        ).hexdigest()
+
+    async def get(
+        self, cacheable: bool, request: Dict[str, Any]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """The key of `request` and the cached message, None on a miss."""
+        key = self.key(request)
+        if not (self.enabled and cacheable):
+            self.bypassed += 1
+            return key, None
+        message = self._memory_get(key)
+        if message is not None:
+            self.memory_hits += 1
+            return key, message
+        if self.backend == "postgres":
+            message = await self._database_get(key)
+            if message is not None:
+                self.database_hits += 1
+                self._memory_put(key, message)
+                return key, message
+        self.misses += 1
+        return key, None
+
+    async def put(
+        self,
+        route_type: RouteTypes,
+        cacheable: bool,
+        key: str,
+        message: Dict[str, Any],
+    ) -> None:
+        if not (self.enabled and cacheable):
+            return
+        self.writes += 1
+        self._memory_put(key, message)
+        if self.backend == "postgres":
+            await self._database_put(route_type, key, message)
+
+    def stats(self) -> LlmCacheStats:
+        return LlmCacheStats(
+            backend=self.backend if self.enabled else "disabled",
+            size=len(self.entries),
+            capacity=self.capacity,
+            memory_hits=self.memory_hits,
+            database_hits=self.database_hits,
+            misses=self.misses,
+            bypassed=self.bypassed,
+            writes=self.writes,
+            evicted=self.evicted,
+        )
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        message, stored_at = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self.entries[key]
+            self.evicted += 1
+            return None
+        self.entries.move_to_end(key)
+        return message
+
+    def _memory_put(self, key: str, message: Dict[str, Any]) -> None:
+        self.entries[key] = (message, time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evicted += 1
+
+    async def _database_get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            async with DatabaseEngine().async_session_maker() as db_session:
+                result = await db_session.execute(
+                    select(LlmResponse.message).where(
+                        LlmResponse.key == key,
+                        LlmResponse.created_at > self._expired_before(),
+                    )
+                )
+                return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            # a cache outage only costs the LLM call it would have saved
+            LOGGER.warning(f"could not read the llm response cache: {e}")
+            return None
+
+    async def _database_put(
+        self, route_type: RouteTypes, key: str, message: Dict[str, Any]
+    ) -> None:
+        now = GetCurrentTime.get()
+        try:
+            async with DatabaseEngine().async_session_maker() as db_session:
+                async with db_session.begin():
+                    await db_session.execute(
+                        insert(LlmResponse)
+                        .values(
+                            key=key,
+                            route=route_type.value,
+                            message=message,
+                            created_at=now,
+                            updated_at=now,
+                        )
+                        .on_conflict_do_update(
+                            index_elements=[LlmResponse.key],
+                            set_={
+                                "message": message,
+                                "created_at": now,
+                                "updated_at": now,
+                            },
+                        )
+                    )
+                    if self.writes % self.evict_every == 0:
+                        await self._evict(db_session)
+        except SQLAlchemyError as e:
+            LOGGER.warning(f"could not write the llm response cache: {e}")
+
+    async def _evict(self, db_session: AsyncSession) -> None:
+        expired = await db_session.execute(
+            delete(LlmResponse).where(LlmResponse.created_at <= self._expired_before())
+        )
+        # beyond `max_rows`, the oldest entries go first
+        overflow = (
+            select(LlmResponse.id)
+            .order_by(LlmResponse.created_at.desc())
+            .offset(self.max_rows)
+        )
+        oversized = await db_session.execute(
+            delete(LlmResponse).where(LlmResponse.id.in_(overflow))
+        )
+        self.evicted += expired.rowcount + oversized.rowcount
+
+    def _expired_before(self):
+        return GetCurrentTime.get() - timedelta(seconds=self.ttl)
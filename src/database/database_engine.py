@@ -1,9 +1,11 @@
 import logging
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from pylib_0xe.database.infos.database_info import DatabaseInfo
 from pylib_0xe.decorators.singleton import singleton
 from pylib_0xe.config.config import Config
 
+from src.database.schema_migrations import SCHEMA_MIGRATIONS
 from src.models.decorated_base import DecoratedBase
 
 LOGGER = logging.getLogger("[ENGINE]")
@@ -12,7 +14,10 @@ LOGGER = logging.getLogger("[ENGINE]")
 @singleton
 class DatabaseEngine:
     engine: Engine
+    async_engine: AsyncEngine
+    async_session_maker: async_sessionmaker
     url: str
+    conninfo: str
 
     def __init__(self) -> None:
         postgres_data = DatabaseInfo(**Config.read_env("db"))
@@ -24,9 +29,24 @@ class DatabaseEngine:
             postgres_data.port,
             postgres_data.db,
         )
+        # plain libpq form of the url, for raw psycopg connections
+        self.conninfo = self.url.replace("postgresql+psycopg://", "postgresql://", 1)
         self.engine = create_engine(
             url=self.url,
             echo=False,
             pool_pre_ping=True,
         )
+        self.async_engine = create_async_engine(
+            url=self.url,
+            echo=False,
+            pool_pre_ping=True,
+            pool_size=Config.read("main.database.pool_size"),
+            max_overflow=Config.read("main.database.max_overflow"),
+        )
+        self.async_session_maker = async_sessionmaker(
+            self.async_engine, expire_on_commit=False
+        )
         DecoratedBase.metadata.create_all(self.engine)
+        with self.engine.begin() as connection:
+            for statement in SCHEMA_MIGRATIONS:
+                connection.execute(text(statement))
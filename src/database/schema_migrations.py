@@ -0,0 +1,80 @@
+from typing import List
+
+# `create_all` only creates missing tables; columns and types added to
+# existing tables are listed here as idempotent statements, run in order on
+# every start-up.
+SCHEMA_MIGRATIONS: List[str] = [
+    "ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS prompt_version VARCHAR",
+    # legacy rows may hold text that is not JSON; such values become NULL and
+    # are kept, as text, in `invalid_json_rows` instead of failing start-up
+    """
+    CREATE OR REPLACE FUNCTION safe_jsonb(value text) RETURNS jsonb AS $$
+    BEGIN
+        RETURN value::jsonb;
+    EXCEPTION WHEN others THEN
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql IMMUTABLE
+    """,
+    """
+    DO $$ BEGIN
+        IF (SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'companies' AND column_name = 'data') <> 'jsonb' THEN
+            CREATE TABLE IF NOT EXISTS invalid_json_rows (
+                table_name VARCHAR, row_id VARCHAR, value TEXT
+            );
+            INSERT INTO invalid_json_rows
+                SELECT 'companies', id, data::text FROM companies
+                WHERE data IS NOT NULL AND safe_jsonb(data::text) IS NULL;
+            ALTER TABLE companies ALTER COLUMN data TYPE jsonb
+                USING safe_jsonb(data::text);
+        END IF;
+        IF (SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'chat_sessions' AND column_name = 'messages') <> 'jsonb' THEN
+            CREATE TABLE IF NOT EXISTS invalid_json_rows (
+                table_name VARCHAR, row_id VARCHAR, value TEXT
+            );
+            INSERT INTO invalid_json_rows
+                SELECT 'chat_sessions', id, messages::text FROM chat_sessions
+                WHERE messages IS NOT NULL AND safe_jsonb(messages::text) IS NULL;
+            ALTER TABLE chat_sessions ALTER COLUMN messages TYPE jsonb
+                USING safe_jsonb(messages::text);
+        END IF;
+    END $$
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_companies_data ON companies USING gin (data jsonb_path_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_companies_company_industry ON companies ((data ->> 'company_industry'))",
+    "CREATE INDEX IF NOT EXISTS ix_companies_job_position ON companies ((data ->> 'job_position'))",
+    "ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS summary VARCHAR",
+    "ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS summarized_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE companies ADD COLUMN IF NOT EXISTS status VARCHAR NOT NULL DEFAULT 'final'",
+    "ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS draft_merged_count INTEGER",
+    # the facet counts start out from the requirements indexed before them;
+    # afterwards indexing keeps them up to date
+    """
+    INSERT INTO field_facet_counts (id, stack_field, companies, created_at, updated_at)
+    SELECT gen_random_uuid()::text, stack_field, count(DISTINCT company_id), now(), now()
+    FROM company_requirements
+    WHERE NOT EXISTS (SELECT 1 FROM field_facet_counts)
+    GROUP BY stack_field
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO stack_facet_counts
+        (id, stack_field, stack_name, companies, created_at, updated_at)
+    SELECT gen_random_uuid()::text, stack_field, stack_name,
+        count(DISTINCT company_id), now(), now()
+    FROM company_requirements
+    WHERE NOT EXISTS (SELECT 1 FROM stack_facet_counts)
+    GROUP BY stack_field, stack_name
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO term_facet_counts
+        (id, stack_field, stack_name, term, count, created_at, updated_at)
+    SELECT gen_random_uuid()::text, stack_field, stack_name, term, count(*), now(), now()
+    FROM company_requirements, unnest(deep_requirements) AS term
+    WHERE NOT EXISTS (SELECT 1 FROM term_facet_counts)
+    GROUP BY stack_field, stack_name, term
+    ON CONFLICT DO NOTHING
+    """,
+]
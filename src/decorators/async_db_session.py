@@ -0,0 +1,40 @@
+from functools import wraps
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.database_engine import DatabaseEngine
+
+
+def async_db_session(func):
+    """
+    Async counterpart of pylib's `db_session`: injects an `AsyncSession` from
+    the pool, commits on success and closes it unless `db_session_keep_alive`
+    is set. A caller-provided `session` is used as-is and left to the caller.
+    """
+
+    @wraps(func)
+    async def wrapper(
+        *args,
+        session: Optional[AsyncSession] = None,
+        db_session_keep_alive: bool = False,
+        **kwargs,
+    ):
+        if session is not None:
+            return await func(*args, session=session, **kwargs)
+        session = DatabaseEngine().async_session_maker()
+        keep_open = False
+        try:
+            result = await func(*args, session=session, **kwargs)
+            await session.commit()
+            keep_open = db_session_keep_alive
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            # also on cancellation, which is not an Exception: closing
+            # returns the connection to the pool right away
+            if not keep_open:
+                await session.close()
+        return result
+
+    return wrapper
@@ -0,0 +1,40 @@
+import time
+from typing import List
+
+from src.mediators.message_queue_mediator import MessageQueueMediator
+
+
+class DeltaBatcher:
+    """
+    Collects the streamed deltas of one turn and publishes them once
+    `max_chars` have piled up or `interval` seconds have passed, so the
+    pub/sub round trip is paid per batch instead of per token. The tail is
+    never flushed on its own: the done or error event ending the turn
+    supersedes it.
+    """
+
+    def __init__(self, session_id: str, interval: float, max_chars: int) -> None:
+        self.session_id = session_id
+        self.interval = interval
+        self.max_chars = max_chars
+        self.chunks: List[str] = []
+        self.size = 0
+        self.flushed_at = time.monotonic()
+
+    async def push(self, delta: str) -> None:
+        self.chunks.append(delta)
+        self.size += len(delta)
+        if (
+            self.size >= self.max_chars
+            or time.monotonic() - self.flushed_at >= self.interval
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self.chunks:
+            return
+        content = "".join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        self.flushed_at = time.monotonic()
+        await MessageQueueMediator().put(self.session_id, content, event="delta")
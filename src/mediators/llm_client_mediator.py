@@ -0,0 +1,68 @@
+import logging
+from typing import Optional
+import httpx
+import openai
+from pylib_0xe.config.config import Config
+from pylib_0xe.decorators.singleton import singleton
+
+from src.agents.call_policy import CallPolicy
+
+LOGGER = logging.getLogger(__name__)
+
+
+@singleton
+class LlmClientMediator:
+    """
+    Owns the process-wide AsyncOpenAI client, so every agent shares one
+    keep-alive connection pool to the provider, and the CallPolicy every
+    request to it runs under.
+    """
+
+    def __init__(self) -> None:
+        self.api_key = Config.read_env("openai_api_key")
+        if not self.api_key:
+            raise ValueError(
+                "OPENAI_API_KEY not found in environment variables. Please set it in a .env file or directly."
+            )
+        self.base_url = Config.read_env("base_url")
+        if not self.base_url:
+            raise ValueError(
+                "BASE_URL not found in environment variables. Please set it in a .env file or directly."
+            )
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self.policy = CallPolicy(**Config.read("main.call_policy"))
+
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        if self._client is None:
+            return self.open()
+        return self._client
+
+    def open(self) -> openai.AsyncOpenAI:
+        if self._client is not None:
+            return self._client
+        limits = httpx.Limits(
+            max_connections=Config.read("main.llm.max_connections"),
+            max_keepalive_connections=Config.read("main.llm.max_keepalive_connections"),
+            keepalive_expiry=Config.read("main.llm.keepalive_expiry"),
+        )
+        http_client = openai.DefaultAsyncHttpxClient(
+            limits=limits,
+            http2=Config.read("main.llm.http2"),
+        )
+        self._client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=http_client,
+            # retries are left to the CallPolicy, which also sees the deadline
+            max_retries=0,
+        )
+        LOGGER.info(f"LLM client opened for {self.base_url}")
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is None:
+            return
+        await self._client.close()
+        self._client = None
+        LOGGER.info("LLM client closed")
@@ -1,18 +1,98 @@
 import asyncio
-from typing import Dict
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from pylib_0xe.config.config import Config
 from pylib_0xe.decorators.singleton import singleton
 
+from src.mediators.pubsub.base_pubsub import BasePubSub
+from src.mediators.pubsub.in_memory_pubsub import InMemoryPubSub
+from src.mediators.pubsub.postgres_pubsub import PostgresPubSub
+from src.mediators.session_event_buffer import SessionEventBuffer
+
 
 @singleton
 class MessageQueueMediator:
+    """
+    Routes session events to the SSE streams held by this worker. Events go
+    through the configured pub/sub backend, so a reply produced on one worker
+    reaches a stream opened on another. Every worker also keeps the latest
+    events of each session so reconnecting clients can replay what they
+    missed; idle buffers are evicted by TTL and LRU.
+    """
+
     def __init__(self) -> None:
         self.mq: Dict[str, asyncio.Queue] = {}
+        self.buffers: OrderedDict[str, SessionEventBuffer] = OrderedDict()
+        self.buffer_size: int = Config.read("main.message_queue.buffer_size")
+        self.buffer_ttl: float = Config.read("main.message_queue.buffer_ttl")
+        self.max_buffered_sessions: int = Config.read(
+            "main.message_queue.max_buffered_sessions"
+        )
+        self.pubsub: BasePubSub = self._build_pubsub()
+
+    @staticmethod
+    def _build_pubsub() -> BasePubSub:
+        if Config.read("main.message_queue.backend") == "postgres":
+            return PostgresPubSub(
+                channel=Config.read("main.message_queue.channel"),
+                reconnect_delay=Config.read("main.message_queue.reconnect_delay"),
+            )
+        return InMemoryPubSub()
+
+    async def start(self) -> None:
+        await self.pubsub.start(self._deliver)
+
+    async def stop(self) -> None:
+        await self.pubsub.stop()
+
+    def subscribe(self, key: str, last_event_id: Optional[int] = None) -> asyncio.Queue:
+        """
+        Opens a stream for `key`, pre-filled with the buffered events after
+        `last_event_id`; without one, with the turn still in progress.
+        """
+        queue = asyncio.Queue()
+        for event in self._buffer(key).since(last_event_id):
+            queue.put_nowait(event)
+        self.mq[key] = queue
+        return queue
+
+    def unsubscribe(self, key: str, queue: asyncio.Queue) -> None:
+        # a newer stream of the same session may have replaced this one
+        if self.mq.get(key) is queue:
+            del self.mq[key]
 
     async def get(self, key: str):
         if key in self.mq:
             return await self.mq[key].get()
         return None
 
-    async def put(self, key: str, content: str):
+    async def put(self, key: str, content: str, event: str = "message"):
+        event_id = self._buffer(key).next_id()
+        await self.pubsub.publish(
+            key, {"id": str(event_id), "event": event, "data": content}
+        )
+
+    async def _deliver(self, key: str, event: Dict[str, Any]) -> None:
+        self._buffer(key).append(event)
         if key in self.mq:
-            await self.mq[key].put(content)
+            await self.mq[key].put(event)
+
+    def _buffer(self, key: str) -> SessionEventBuffer:
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = SessionEventBuffer(self.buffer_size)
+            self._evict()
+        else:
+            self.buffers.move_to_end(key)
+        buffer.touch()
+        return buffer
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self.buffers:
+            key, oldest = next(iter(self.buffers.items()))
+            expired = now - oldest.touched_at > self.buffer_ttl
+            if len(self.buffers) <= self.max_buffered_sessions and not expired:
+                return
+            del self.buffers[key]
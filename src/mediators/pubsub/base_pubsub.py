@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict
+
+# (key, event) handed to the mediator of the receiving worker
+DeliverCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class BasePubSub(ABC):
+    @abstractmethod
+    async def start(self, deliver: DeliverCallback) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(self, key: str, event: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    async def stop(self) -> None:
+        pass
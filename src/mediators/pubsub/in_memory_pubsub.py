@@ -0,0 +1,20 @@
+from typing import Any, Dict, Optional
+
+from src.mediators.pubsub.base_pubsub import BasePubSub, DeliverCallback
+
+
+class InMemoryPubSub(BasePubSub):
+    """Delivers events inside the current process only (single worker, tests)."""
+
+    def __init__(self) -> None:
+        self.deliver: Optional[DeliverCallback] = None
+
+    async def start(self, deliver: DeliverCallback) -> None:
+        self.deliver = deliver
+
+    async def publish(self, key: str, event: Dict[str, Any]) -> None:
+        if self.deliver:
+            await self.deliver(key, event)
+
+    async def stop(self) -> None:
+        self.deliver = None
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Dict, List, Optional
+import psycopg
+from sqlalchemy import text
+
+from src.database.database_engine import DatabaseEngine
+from src.mediators.pubsub.base_pubsub import BasePubSub, DeliverCallback
+
+LOGGER = logging.getLogger(__name__)
+
+# NOTIFY payloads must stay below 8000 bytes
+MAX_PAYLOAD_BYTES = 7000
+
+
+class PostgresPubSub(BasePubSub):
+    """
+    Fans events out to every worker through Postgres LISTEN/NOTIFY. Each
+    worker keeps one listening connection; notifications are sent through the
+    async engine pool. Payloads above the NOTIFY limit are split into parts
+    and put back together on the receiving side.
+    """
+
+    def __init__(self, channel: str, reconnect_delay: float) -> None:
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.deliver: Optional[DeliverCallback] = None
+        self.listener: Optional[asyncio.Task] = None
+        self.parts: Dict[str, List[Optional[str]]] = {}
+
+    async def start(self, deliver: DeliverCallback) -> None:
+        self.deliver = deliver
+        self.listener = asyncio.create_task(self._listen())
+
+    async def publish(self, key: str, event: Dict[str, Any]) -> None:
+        payload = json.dumps({"key": key, "event": event})
+        async with DatabaseEngine().async_engine.begin() as connection:
+            for part in self._split(payload):
+                await connection.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.channel, "payload": part},
+                )
+
+    async def stop(self) -> None:
+        if self.listener:
+            self.listener.cancel()
+            await asyncio.gather(self.listener, return_exceptions=True)
+            self.listener = None
+        self.deliver = None
+
+    def _split(self, payload: str) -> List[str]:
+        if len(payload.encode()) <= MAX_PAYLOAD_BYTES:
+            return [payload]
+        # the payload is ascii, but quoting it again may double its length
+        chunk_size = (MAX_PAYLOAD_BYTES - 200) // 2
+        chunks = [
+            payload[start : start + chunk_size]
+            for start in range(0, len(payload), chunk_size)
+        ]
+        message_id = uuid.uuid4().hex
+        return [
+            json.dumps(
+                {"id": message_id, "part": index, "parts": len(chunks), "chunk": chunk}
+            )
+            for index, chunk in enumerate(chunks)
+        ]
+
+    def _join(self, payload: str) -> Optional[str]:
+        message = json.loads(payload)
+        if "chunk" not in message:
+            return payload
+        parts = self.parts.setdefault(message["id"], [None] * message["parts"])
+        parts[message["part"]] = message["chunk"]
+        if any(part is None for part in parts):
+            return None
+        del self.parts[message["id"]]
+        return "".join(parts)  # type: ignore
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    DatabaseEngine().conninfo, autocommit=True
+                ) as connection:
+                    await connection.execute(f'LISTEN "{self.channel}"')
+                    LOGGER.info(f"listening on {self.channel}")
+                    async for notify in connection.notifies():
+                        await self._receive(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                LOGGER.warning(f"listener on {self.channel} dropped: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def _receive(self, payload: str) -> None:
+        joined = self._join(payload)
+        if joined is None or self.deliver is None:
+            return
+        message = json.loads(joined)
+        await self.deliver(message["key"], message["event"])
@@ -0,0 +1,51 @@
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+# events that end a turn and carry its complete outcome
+TURN_END_EVENTS = ("done", "error")
+
+
+class SessionEventBuffer:
+    """
+    Ring buffer of the latest events of one session, used to replay what an
+    SSE client missed while it was not connected.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self.last_id = 0
+        self.touched_at = time.monotonic()
+
+    def touch(self) -> None:
+        self.touched_at = time.monotonic()
+
+    def next_id(self) -> int:
+        # microsecond clock keeps ids increasing across workers and evictions
+        self.last_id = max(self.last_id + 1, time.time_ns() // 1000)
+        return self.last_id
+
+    def append(self, event: Dict[str, Any]) -> None:
+        if event["event"] in TURN_END_EVENTS:
+            # the final reply, or the failure, supersedes the streamed deltas
+            while self.events and self.events[-1]["event"] == "delta":
+                self.events.pop()
+        self.events.append(event)
+        self.last_id = max(self.last_id, int(event["id"]))
+        self.touch()
+
+    def since(self, last_event_id: Optional[int]) -> List[Dict[str, Any]]:
+        if last_event_id is not None:
+            return [event for event in self.events if int(event["id"]) > last_event_id]
+        # a first connect only gets the turn in progress, earlier replies come
+        # from /chat/read; the greeting is replayed while it is the only one,
+        # as a new session's client may connect after it was sent
+        events = list(self.events)
+        ends = [
+            index
+            for index, event in enumerate(events)
+            if event["event"] in TURN_END_EVENTS
+        ]
+        if len(ends) <= 1:
+            return events
+        return events[ends[-1] + 1 :]
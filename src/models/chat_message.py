@@ -0,0 +1,19 @@
+from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.decorated_base import DecoratedBase
+
+
+class ChatMessage(DecoratedBase):
+    __tablename__ = "chat_messages"
+    __table_args__ = (UniqueConstraint("session_id", "seq"),)
+
+    session_id: Mapped[str] = mapped_column(
+        String, ForeignKey("chat_sessions.id", ondelete="CASCADE")
+    )
+    seq: Mapped[int] = mapped_column()
+    role: Mapped[str] = mapped_column(String)
+    content: Mapped[str] = mapped_column()
+
+    def to_message(self) -> dict:
+        return {"role": self.role, "content": self.content}
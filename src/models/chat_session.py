@@ -1,3 +1,5 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.models.decorated_base import DecoratedBase
@@ -6,4 +8,14 @@ from src.models.decorated_base import DecoratedBase
 class ChatSession(DecoratedBase):
     __tablename__ = "chat_sessions"
 
-    messages: Mapped[str] = mapped_column(nullable=True)
+    # legacy history, superseded by the chat_messages table
+    messages: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(
+        JSONB, nullable=True
+    )
+    prompt_version: Mapped[Optional[str]] = mapped_column(nullable=True)
+    # running summary of the first `summarized_count` conversation messages
+    summary: Mapped[Optional[str]] = mapped_column(nullable=True)
+    summarized_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    # history messages merged into the company draft; NULL before the first
+    # merge was recorded
+    draft_merged_count: Mapped[Optional[int]] = mapped_column(nullable=True)
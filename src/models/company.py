@@ -1,11 +1,32 @@
-from sqlalchemy import String
+from typing import Any, Dict, Optional
+from sqlalchemy import Index, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.models.decorated_base import DecoratedBase
+from src.types.company_status import CompanyStatus
 
 
 class Company(DecoratedBase):
     __tablename__ = "companies"
 
     session_id: Mapped[str] = mapped_column(String, index=True, unique=True)
-    data: Mapped[str] = mapped_column(nullable=True)
+    # a validated JobPostingOutput, or a JobPostingDraft while drafting
+    data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    status: Mapped[str] = mapped_column(
+        String,
+        default=CompanyStatus.FINAL.value,
+        server_default=CompanyStatus.FINAL.value,
+    )
+
+
+# containment queries (e.g. on requirements[].stack_name) use the GIN index,
+# equality on the scalar fields uses the expression indexes
+Index(
+    "ix_companies_data",
+    Company.data,
+    postgresql_using="gin",
+    postgresql_ops={"data": "jsonb_path_ops"},
+)
+Index("ix_companies_company_industry", Company.data["company_industry"].astext)
+Index("ix_companies_job_position", Company.data["job_position"].astext)
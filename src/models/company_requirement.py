@@ -0,0 +1,30 @@
+from typing import Any, List
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.decorated_base import DecoratedBase
+
+
+class CompanyRequirement(DecoratedBase):
+    """
+    One `StackDetail` of a company's job posting, normalized for search.
+    Rebuilt from `Company.data` every time the company is upserted.
+    """
+
+    __tablename__ = "company_requirements"
+    __table_args__ = (
+        Index("ix_company_requirements_stack", "stack_name", "stack_field"),
+        Index("ix_company_requirements_field", "stack_field", "stack_name"),
+    )
+
+    company_id: Mapped[str] = mapped_column(
+        String, ForeignKey("companies.id", ondelete="CASCADE"), index=True
+    )
+    stack_field: Mapped[str] = mapped_column(String)
+    stack_name: Mapped[str] = mapped_column(String)
+    deep_requirements: Mapped[List[str]] = mapped_column(ARRAY(String), default=list)
+
+    @staticmethod
+    def normalize(value: Any) -> str:
+        return " ".join(str(value).split()).lower()
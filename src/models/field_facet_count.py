@@ -0,0 +1,16 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.decorated_base import DecoratedBase
+
+
+class FieldFacetCount(DecoratedBase):
+    """
+    Companies requiring a stack field, kept up to date whenever the
+    requirements of a company are indexed.
+    """
+
+    __tablename__ = "field_facet_counts"
+
+    stack_field: Mapped[str] = mapped_column(String, unique=True)
+    companies: Mapped[int] = mapped_column(default=0, index=True)
@@ -0,0 +1,18 @@
+from typing import Any, Dict
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.decorated_base import DecoratedBase
+
+
+class LlmResponse(DecoratedBase):
+    """Second tier of the LLM response cache, shared by all workers."""
+
+    __tablename__ = "llm_responses"
+
+    # sha256 of the normalized request
+    key: Mapped[str] = mapped_column(String, unique=True)
+    route: Mapped[str] = mapped_column(String)
+    # the assistant message of the completion
+    message: Mapped[Dict[str, Any]] = mapped_column(JSONB)
@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.decorated_base import DecoratedBase
+
+
+class RateLimitBucket(DecoratedBase):
+    """A token bucket shared by all workers; the id is `<scope>:<key>`."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    tokens: Mapped[float] = mapped_column()
+    refilled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    # whether the last acquire took a token
+    granted: Mapped[bool] = mapped_column()
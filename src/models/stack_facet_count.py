@@ -0,0 +1,21 @@
+from sqlalchemy import Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.decorated_base import DecoratedBase
+
+
+class StackFacetCount(DecoratedBase):
+    """
+    Companies requiring a stack of a field, kept up to date whenever the
+    requirements of a company are indexed.
+    """
+
+    __tablename__ = "stack_facet_counts"
+    __table_args__ = (
+        UniqueConstraint("stack_field", "stack_name"),
+        Index("ix_stack_facet_counts_field_companies", "stack_field", "companies"),
+    )
+
+    stack_field: Mapped[str] = mapped_column(String)
+    stack_name: Mapped[str] = mapped_column(String)
+    companies: Mapped[int] = mapped_column(default=0)
@@ -0,0 +1,20 @@
+from sqlalchemy import String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.decorated_base import DecoratedBase
+
+
+class TermFacetCount(DecoratedBase):
+    """
+    How often a deep requirement is asked for a stack of a field, kept up to
+    date whenever the requirements of a company are indexed.
+    """
+
+    __tablename__ = "term_facet_counts"
+    # the unique index also serves lookups by stack name
+    __table_args__ = (UniqueConstraint("stack_name", "stack_field", "term"),)
+
+    stack_field: Mapped[str] = mapped_column(String)
+    stack_name: Mapped[str] = mapped_column(String)
+    term: Mapped[str] = mapped_column(String)
+    count: Mapped[int] = mapped_column(default=0)
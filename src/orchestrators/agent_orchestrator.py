@@ -1,14 +1,35 @@
-import asyncio
+import json
+from typing import Awaitable, Dict, List, Optional
+from pydantic import ValidationError
 from pylib_0xe.config.config import Config
 from pylib_0xe.decorators.singleton import singleton
 import logging
 
+from src.mediators.delta_batcher import DeltaBatcher
 from src.mediators.message_queue_mediator import MessageQueueMediator
-from src.actions.chat_session.update_chat_session import UpdateChatSession
+from src.actions.chat_session.append_chat_messages import AppendChatMessages
+from src.actions.chat_session.read_chat_history import ReadChatHistory
+from src.actions.chat_session.update_chat_summary import UpdateChatSummary
+from src.actions.chat_session.update_draft_merged_count import (
+    UpdateDraftMergedCount,
+)
 from src.actions.company.upsert_company import UpsertCompany
 from src.models.chat_session import ChatSession
-from src.repositories.repository import Repository
-from src.agents.agent_1 import Agent as Agent1
+from src.models.company import Company
+from src.repositories.async_repository import AsyncRepository
+from src.repositories.company_repository import CompanyRepository
+from src.agents.agent_1 import (
+    LEGACY_PROMPT_VERSION,
+    Agent as Agent1,
+    JobPostingDraft,
+)
+from src.caches.greeting_cache import GreetingCache
+from src.orchestrators.agent_scheduler import AgentScheduler
+from src.orchestrators.session_actor import ActorMessage, SessionActor
+from src.types.actor_message_types import ActorMessageTypes
+from src.types.company_status import CompanyStatus
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
 
 LOGGER = logging.getLogger(__name__)
 
@@ -17,21 +38,176 @@ LOGGER = logging.getLogger(__name__)
 class AgentOrchestrator:
     def __init__(self) -> None:
         MessageQueueMediator()
+        self.scheduler = AgentScheduler(
+            concurrency=Config.read("main.scheduler.concurrency"),
+            max_queue_size=Config.read("main.scheduler.max_queue_size"),
+            drain_timeout=Config.read("main.scheduler.drain_timeout"),
+            retry_after=Config.read("main.scheduler.retry_after"),
+        )
+        self.actors: Dict[str, SessionActor] = {}
 
-    async def dispatch_query(self, session_id: str, user_message: str):
-        chat_session, _ = Repository(ChatSession).read_by_id(session_id)
-        agent = Agent1()
-        response, _, built_data = agent.shot(chat_session.messages, user_message)
+    def start(self) -> None:
+        self.scheduler.start()
+
+    async def shutdown(self) -> None:
+        await self.scheduler.shutdown()
+
+    def submit_query(self, session_id: str, user_message: str) -> None:
+        self._post(
+            session_id, ActorMessage(ActorMessageTypes.USER_MESSAGE, user_message)
+        )
+
+    def submit_greetings(self, session_id: str, prompt_version: str) -> None:
+        self._post(session_id, ActorMessage(ActorMessageTypes.GREETING, prompt_version))
+
+    def _post(self, session_id: str, message: ActorMessage) -> None:
+        try:
+            self._actor(session_id).post(message)
+        finally:
+            # drops the actor again when the scheduler refused the first job
+            self._release_actor(session_id)
+
+    def _actor(self, session_id: str) -> SessionActor:
+        if session_id not in self.actors:
+            self.actors[session_id] = SessionActor(
+                session_id=session_id,
+                scheduler=self.scheduler,
+                greet=self.dispatch_greetings,
+                reply=self.dispatch_query,
+                draft=self.dispatch_draft,
+                fail=self._push_error,
+                on_idle=self._release_actor,
+                max_mailbox=Config.read("main.scheduler.max_mailbox"),
+                coalesce=Config.read("main.scheduler.coalesce_messages"),
+            )
+        return self.actors[session_id]
+
+    def _release_actor(self, session_id: str) -> None:
+        actor = self.actors.get(session_id)
+        if actor and actor.is_idle():
+            del self.actors[session_id]
+
+    async def dispatch_query(self, session_id: str, user_messages: List[str]):
+        await self._reported(session_id, self._query(session_id, user_messages))
+
+    async def _query(self, session_id: str, user_messages: List[str]):
+        chat_session, _ = await AsyncRepository(ChatSession).read_by_id(session_id)
+        history, next_seq = await ReadChatHistory(chat_session).read()
+        agent = self._agent(chat_session)
+        response, new_messages = await agent.shot(
+            history,
+            user_messages,
+            on_delta=self._delta_pusher(session_id),
+            summary=chat_session.summary,
+            summarized_count=chat_session.summarized_count,
+        )
         LOGGER.info(f"response: {response}")
-        UpdateChatSession(session_id, agent.history()).update()
+        await AppendChatMessages(session_id, next_seq, new_messages).append()
+        if agent.summarized_count != chat_session.summarized_count:
+            await UpdateChatSummary(
+                session_id, agent.summary, agent.summarized_count
+            ).update()
+        await MessageQueueMediator().put(session_id, response, event="done")
+        # the reply is out; the draft catches up with it in a job of its own
+        self._post(session_id, ActorMessage(ActorMessageTypes.DRAFT, str(len(history))))
+
+    async def dispatch_draft(self, session_id: str, turn_start: str):
+        chat_session, _ = await AsyncRepository(ChatSession).read_by_id(session_id)
+        history, _ = await ReadChatHistory(chat_session).read()
+        company, _ = await CompanyRepository(Company).read_by_session_id(session_id)
+        agent = self._agent(chat_session)
+        # turns of an earlier failed merge are merged again
+        merged_count = chat_session.draft_merged_count
+        try:
+            built_data = await agent.follow_up(
+                history,
+                int(turn_start) if merged_count is None else merged_count,
+                summary=chat_session.summary,
+                summarized_count=chat_session.summarized_count,
+                draft=self._draft(company),
+            )
+        except ServerException as e:
+            # the turn itself was answered already; only the draft lags behind
+            LOGGER.warning(f"could not update the draft of {session_id}: {e.detail}")
+            return
         if built_data:
             LOGGER.info(f"going to save this data to DB: {built_data}")
-            UpsertCompany(session_id, built_data).upsert()
-        await MessageQueueMediator().put(session_id, response)
-
-    async def dispatch_greetings(self, session_id: str):
-        agent = Agent1()
-        response = agent.get_initial_greeting()
-        await asyncio.sleep(Config.read("main.greetings.sleep"))
-        UpdateChatSession(session_id, agent.history()).update()
-        await MessageQueueMediator().put(session_id, response)
+            await UpsertCompany(session_id, built_data).upsert()
+        elif agent.draft_changed and (
+            company is None or company.status == CompanyStatus.DRAFT.value
+        ):
+            # a finished posting is only replaced by the next final one
+            await UpsertCompany(
+                session_id, agent.draft.model_dump_json(), CompanyStatus.DRAFT  # type:ignore
+            ).upsert()
+        if agent.draft_merged:
+            await UpdateDraftMergedCount(session_id, len(history)).update()
+
+    @staticmethod
+    def _agent(chat_session: ChatSession) -> Agent1:
+        return Agent1(
+            prompt_version=chat_session.prompt_version or LEGACY_PROMPT_VERSION
+        )
+
+    @staticmethod
+    def _draft(company: Optional[Company]) -> Optional[JobPostingDraft]:
+        if company is None or not company.data:
+            return None
+        try:
+            return JobPostingDraft.model_validate(company.data)
+        except ValidationError:
+            return None
+
+    async def dispatch_greetings(self, session_id: str, prompt_version: str):
+        await self._reported(session_id, self._greet(session_id, prompt_version))
+
+    async def _greet(self, session_id: str, prompt_version: str):
+        agent = Agent1(prompt_version=prompt_version)
+        response = GreetingCache().get(agent)
+        if response is None:
+            response = await agent.get_initial_greeting(
+                on_delta=self._delta_pusher(session_id)
+            )
+            GreetingCache().add(agent, response)
+        else:
+            agent.accept_greeting(response)
+        await AppendChatMessages(session_id, 0, agent.new_messages()).append()
+        await MessageQueueMediator().put(session_id, response, event="done")
+
+    async def _reported(self, session_id: str, turn: Awaitable[None]) -> None:
+        """
+        Runs a turn; whatever makes it fail reaches the client as an `error`
+        event. A turn that fails before its messages are appended leaves
+        nothing behind; the client sends it again.
+        """
+        try:
+            await turn
+        except ServerException as e:
+            await self._push_error(session_id, e)
+        except Exception:
+            LOGGER.exception(f"agent turn for {session_id} failed")
+            await self._push_error(
+                session_id, ServerException(ExceptionTypes.INTERNAL_ERROR)
+            )
+
+    @staticmethod
+    async def _push_error(session_id: str, error: ServerException) -> None:
+        LOGGER.warning(f"agent turn for {session_id} failed: {error.detail}")
+        await MessageQueueMediator().put(
+            session_id,
+            json.dumps(
+                {
+                    "error": error.exception_type.value,
+                    "retry_after": error.retry_after,
+                }
+            ),
+            event="error",
+        )
+
+    @staticmethod
+    def _delta_pusher(session_id: str):
+        return DeltaBatcher(
+            session_id,
+            interval=Config.read("main.message_queue.delta_interval"),
+            max_chars=Config.read("main.message_queue.delta_max_chars"),
+        ).push
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from src.types.api.agent_scheduler_stats import AgentSchedulerStats
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledJob:
+    session_id: str
+    factory: Callable[[], Awaitable[None]]
+    enqueued_at: float
+
+
+class AgentScheduler:
+    """
+    Runs agent jobs on a fixed number of workers. Pending jobs wait in a
+    bounded queue that is served round-robin across sessions, so one busy
+    session cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        max_queue_size: int,
+        drain_timeout: float,
+        retry_after: int,
+    ) -> None:
+        self.concurrency = concurrency
+        self.max_queue_size = max_queue_size
+        self.drain_timeout = drain_timeout
+        self.retry_after = retry_after
+        self.queues: Dict[str, Deque[ScheduledJob]] = {}
+        self.ready: Deque[str] = deque()
+        self.queued = 0
+        self.in_flight = 0
+        self.closing = False
+        self.workers: List[asyncio.Task] = []
+        self.available: Optional[asyncio.Semaphore] = None
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def start(self) -> None:
+        self.available = asyncio.Semaphore(0)
+        self.workers = [
+            asyncio.create_task(self._work()) for _ in range(self.concurrency)
+        ]
+
+    def check_capacity(self, continuation: bool = False) -> None:
+        if (
+            self.closing
+            or self.available is None
+            or (not continuation and self.queued >= self.max_queue_size)
+        ):
+            self.rejected += 1
+            raise ServerException(
+                ExceptionTypes.AGENT_QUEUE_FULL, retry_after=self.retry_after
+            )
+
+    def submit(
+        self,
+        session_id: str,
+        factory: Callable[[], Awaitable[None]],
+        continuation: bool = False,
+    ) -> None:
+        """
+        Queues a job. A `continuation` is submitted by a running job of the
+        same session and takes the queue slot that job freed, so it is not
+        held to the queue size.
+        """
+        self.check_capacity(continuation)
+        queue = self.queues.setdefault(session_id, deque())
+        if not queue:
+            self.ready.append(session_id)
+        queue.append(ScheduledJob(session_id, factory, time.monotonic()))
+        self.queued += 1
+        self.submitted += 1
+        self.available.release()  # type: ignore
+
+    async def shutdown(self) -> None:
+        """Stops accepting jobs, drains the queue and cancels what is left."""
+        if self.available is None:
+            return
+        self.closing = True
+        for _ in self.workers:
+            self.available.release()
+        _, pending = await asyncio.wait(self.workers, timeout=self.drain_timeout)
+        for worker in pending:
+            worker.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if pending:
+            LOGGER.warning(
+                f"cancelled {len(pending)} agent workers, {self.queued} jobs dropped"
+            )
+        self.workers = []
+
+    def stats(self) -> AgentSchedulerStats:
+        started = self.completed + self.failed + self.in_flight
+        return AgentSchedulerStats(
+            concurrency=self.concurrency,
+            queue_capacity=self.max_queue_size,
+            queue_depth=self.queued,
+            queued_sessions=len(self.ready),
+            in_flight=self.in_flight,
+            submitted=self.submitted,
+            completed=self.completed,
+            failed=self.failed,
+            rejected=self.rejected,
+            avg_wait_seconds=self.total_wait / started if started else 0.0,
+            max_wait_seconds=self.max_wait,
+        )
+
+    def _pop(self) -> ScheduledJob:
+        session_id = self.ready.popleft()
+        queue = self.queues[session_id]
+        job = queue.popleft()
+        if queue:
+            self.ready.append(session_id)
+        else:
+            del self.queues[session_id]
+        self.queued -= 1
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            await self.available.acquire()  # type: ignore
+            if not self.ready:
+                # only reachable through the permits released by shutdown
+                return
+            job = self._pop()
+            wait = time.monotonic() - job.enqueued_at
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.in_flight += 1
+            try:
+                await job.factory()
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                LOGGER.exception(f"agent job for {job.session_id} failed: {e}")
+            finally:
+                self.in_flight -= 1
@@ -0,0 +1,169 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Tuple
+from pylib_0xe.config.config import Config
+from pylib_0xe.decorators.singleton import singleton
+from pylib_0xe.utils.time.get_current_time import GetCurrentTime
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.database_engine import DatabaseEngine
+from src.models.rate_limit_bucket import RateLimitBucket
+from src.types.api.rate_limit_stats import RateLimitStats
+from src.types.exception_types import ExceptionTypes
+from src.types.rate_limit_scopes import RateLimitScopes
+from src.types.server_exception import ServerException
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class TokenBucket:
+    tokens: float
+    refilled_at: float
+
+
+@dataclass
+class BucketLimits:
+    capacity: float
+    # tokens per second
+    refill_rate: float
+
+    def retry_after(self, tokens: float) -> int:
+        return max(math.ceil((1 - tokens) / self.refill_rate), 1)
+
+
+@singleton
+class RateLimiter:
+    """
+    Token buckets per session and per client in front of the agent. Buckets
+    live in this worker's memory, or in the `rate_limit_buckets` table when
+    `main.rate_limit.backend` is `postgres` so every worker shares them.
+    An empty bucket raises RATE_LIMITED with the seconds until a refill.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = Config.read("main.rate_limit.enabled")
+        self.backend: str = Config.read("main.rate_limit.backend")
+        self.max_buckets: int = Config.read("main.rate_limit.max_buckets")
+        self.evict_every: int = Config.read("main.rate_limit.evict_every")
+        self.limits: Dict[RateLimitScopes, BucketLimits] = {
+            scope: BucketLimits(**Config.read(f"main.rate_limit.{scope.value}"))
+            for scope in RateLimitScopes
+        }
+        self.buckets: OrderedDict[Tuple[RateLimitScopes, str], TokenBucket] = (
+            OrderedDict()
+        )
+        self.allowed = {scope: 0 for scope in RateLimitScopes}
+        self.limited = {scope: 0 for scope in RateLimitScopes}
+        # takes from the shared buckets, granted or not; paces the eviction
+        self.database_takes = 0
+
+    async def acquire(self, scope: RateLimitScopes, key: str) -> None:
+        if not self.enabled:
+            return
+        if self.backend == "postgres":
+            try:
+                granted, tokens = await self._database_take(scope, key)
+            except SQLAlchemyError as e:
+                # keep limiting per worker while the shared buckets are away
+                LOGGER.warning(f"shared rate limit unavailable: {e}")
+                granted, tokens = self._memory_take(scope, key)
+        else:
+            granted, tokens = self._memory_take(scope, key)
+        if not granted:
+            self.limited[scope] += 1
+            raise ServerException(
+                ExceptionTypes.RATE_LIMITED,
+                retry_after=self.limits[scope].retry_after(tokens),
+            )
+        self.allowed[scope] += 1
+
+    def stats(self) -> RateLimitStats:
+        return RateLimitStats(
+            backend=self.backend if self.enabled else "disabled",
+            buckets=len(self.buckets),
+            allowed={scope.value: count for scope, count in self.allowed.items()},
+            limited={scope.value: count for scope, count in self.limited.items()},
+        )
+
+    def _memory_take(self, scope: RateLimitScopes, key: str) -> Tuple[bool, float]:
+        limits = self.limits[scope]
+        now = time.monotonic()
+        bucket = self.buckets.get((scope, key))
+        if bucket is None:
+            bucket = TokenBucket(limits.capacity, now)
+            self.buckets[(scope, key)] = bucket
+            if len(self.buckets) > self.max_buckets:
+                # the least recently used buckets have refilled the longest
+                self.buckets.popitem(last=False)
+        self.buckets.move_to_end((scope, key))
+        bucket.tokens = min(
+            limits.capacity,
+            bucket.tokens + (now - bucket.refilled_at) * limits.refill_rate,
+        )
+        bucket.refilled_at = now
+        if bucket.tokens < 1:
+            return False, bucket.tokens
+        bucket.tokens -= 1
+        return True, bucket.tokens
+
+    async def _database_take(
+        self, scope: RateLimitScopes, key: str
+    ) -> Tuple[bool, float]:
+        limits = self.limits[scope]
+        now = GetCurrentTime.get()
+        # refill and take in one statement, so concurrent workers serialize
+        # on the row instead of racing on a read-modify-write
+        refilled = func.least(
+            limits.capacity,
+            RateLimitBucket.tokens
+            + func.extract("epoch", func.now() - RateLimitBucket.refilled_at)
+            * limits.refill_rate,
+        )
+        statement = (
+            insert(RateLimitBucket)
+            .values(
+                id=f"{scope.value}:{key}",
+                tokens=limits.capacity - 1,
+                refilled_at=func.now(),
+                granted=True,
+                created_at=now,
+                updated_at=now,
+            )
+            .on_conflict_do_update(
+                index_elements=[RateLimitBucket.id],
+                set_={
+                    "tokens": refilled - case((refilled >= 1, 1), else_=0),
+                    "granted": refilled >= 1,
+                    "refilled_at": func.now(),
+                    "updated_at": now,
+                },
+            )
+            .returning(RateLimitBucket.granted, RateLimitBucket.tokens)
+        )
+        async with DatabaseEngine().async_session_maker() as db_session:
+            async with db_session.begin():
+                granted, tokens = (await db_session.execute(statement)).one()
+                self.database_takes += 1
+                if self.database_takes % self.evict_every == 0:
+                    await self._evict(db_session)
+        return granted, tokens
+
+    async def _evict(self, db_session: AsyncSession) -> None:
+        # a bucket idle for longer than its refill time is full again, and
+        # a missing row starts out full as well
+        idle = max(
+            limits.capacity / limits.refill_rate for limits in self.limits.values()
+        )
+        await db_session.execute(
+            delete(RateLimitBucket).where(
+                RateLimitBucket.refilled_at < func.now() - timedelta(seconds=idle)
+            )
+        )
@@ -0,0 +1,119 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, List
+
+from src.orchestrators.agent_scheduler import AgentScheduler
+from src.types.actor_message_types import ActorMessageTypes
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ActorMessage:
+    message_type: ActorMessageTypes
+    # the prompt version for greetings, the text for user messages, the
+    # history index of the first unmerged message for drafts
+    payload: str
+
+
+class SessionActor:
+    """
+    Mailbox of a single chat session. At most one job per session is handed
+    to the scheduler at a time, so turns of a session never overlap while
+    different sessions still run in parallel. User messages that pile up
+    during an in-flight turn are answered together by a single LLM call.
+    The draft is updated by a job of its own after a turn was answered; one
+    queued draft job covers every turn answered before it runs.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        scheduler: AgentScheduler,
+        greet: Callable[[str, str], Awaitable[None]],
+        reply: Callable[[str, List[str]], Awaitable[None]],
+        draft: Callable[[str, str], Awaitable[None]],
+        fail: Callable[[str, ServerException], Awaitable[None]],
+        on_idle: Callable[[str], None],
+        max_mailbox: int,
+        coalesce: bool,
+    ) -> None:
+        self.session_id = session_id
+        self.scheduler = scheduler
+        self.greet = greet
+        self.reply = reply
+        self.draft = draft
+        self.fail = fail
+        self.on_idle = on_idle
+        self.max_mailbox = max_mailbox
+        self.coalesce = coalesce
+        self.mailbox: Deque[ActorMessage] = deque()
+        self.scheduled = False
+
+    def is_idle(self) -> bool:
+        return not self.scheduled and not self.mailbox
+
+    def post(self, message: ActorMessage) -> None:
+        if message.message_type is ActorMessageTypes.DRAFT:
+            # follows a turn that was already accepted, so it is never refused
+            if any(
+                queued.message_type is ActorMessageTypes.DRAFT
+                for queued in self.mailbox
+            ):
+                return
+        elif len(self.mailbox) >= self.max_mailbox:
+            raise ServerException(
+                ExceptionTypes.AGENT_QUEUE_FULL,
+                retry_after=self.scheduler.retry_after,
+            )
+        if not self.scheduled:
+            self.scheduler.submit(self.session_id, self._run)
+            self.scheduled = True
+        self.mailbox.append(message)
+
+    async def _run(self) -> None:
+        try:
+            message = self.mailbox.popleft()
+            if message.message_type is ActorMessageTypes.GREETING:
+                await self.greet(self.session_id, message.payload)
+            elif message.message_type is ActorMessageTypes.DRAFT:
+                await self.draft(self.session_id, message.payload)
+            else:
+                await self.reply(self.session_id, self._take_user_messages(message))
+        finally:
+            self.scheduled = False
+            await self._reschedule()
+
+    def _take_user_messages(self, first: ActorMessage) -> List[str]:
+        user_messages = [first.payload]
+        while (
+            self.coalesce
+            and self.mailbox
+            and self.mailbox[0].message_type is ActorMessageTypes.USER_MESSAGE
+        ):
+            user_messages.append(self.mailbox.popleft().payload)
+        return user_messages
+
+    async def _reschedule(self) -> None:
+        if not self.mailbox:
+            self.on_idle(self.session_id)
+            return
+        try:
+            self.scheduler.submit(self.session_id, self._run, continuation=True)
+            self.scheduled = True
+        except ServerException as e:
+            # only while shutting down; the accepted messages would never be
+            # answered, so the client is told to send them again
+            user_messages = [
+                message
+                for message in self.mailbox
+                if message.message_type is not ActorMessageTypes.DRAFT
+            ]
+            LOGGER.warning(f"dropped {len(self.mailbox)} messages of {self.session_id}")
+            self.mailbox.clear()
+            self.on_idle(self.session_id)
+            if user_messages:
+                await self.fail(self.session_id, e)
@@ -0,0 +1,187 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import (
+    AsyncIterator,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from pylib_0xe.config.config import Config
+from sqlalchemy import ColumnElement, Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.database_engine import DatabaseEngine
+from src.decorators.async_db_session import async_db_session
+from src.types.api.page_cursor import PageCursor
+from src.types.exception_types import ExceptionTypes
+from src.models.decorated_base import DecoratedBase
+from src.repositories.base_async_repository import BaseAsyncRepository
+from src.repositories.upsert_statement import build_upsert, entity_values
+from src.types.server_exception import ServerException
+
+LOGGER = logging.getLogger(__name__)
+T = TypeVar("T", bound=DecoratedBase)
+
+
+@dataclass
+class AsyncRepository(Generic[T], BaseAsyncRepository[T, str]):
+    model: Type[T]
+
+    @async_db_session
+    async def read_by_id(
+        self, id: str, session: Optional[AsyncSession] = None, *args, **kwargs
+    ) -> Tuple[T, AsyncSession]:
+        """Read by ID operation"""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        result = await session.execute(select(self.model).where(self.model.id == id))
+        return result.scalar_one(), session
+
+    @async_db_session
+    async def read(
+        self,
+        session: Optional[AsyncSession] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[PageCursor] = None,
+        since: Optional[datetime] = None,
+        order_by: str = "created_at",
+        exclude: Set[str] = set(),
+        filters: Sequence[ColumnElement[bool]] = (),
+        *args,
+        **kwargs,
+    ) -> Tuple[List[T], AsyncSession]:
+        """
+        Read operation, keyset-paginated on (`order_by`, id) and narrowed by
+        `filters`. Columns in `exclude` are not fetched; such rows come back
+        as detached entities.
+        """
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        order_column = getattr(self.model, order_by)
+        statement = (
+            self._select(exclude).where(*filters).order_by(order_column, self.model.id)
+        )
+        if since:
+            statement = statement.where(order_column >= since)
+        if cursor:
+            statement = statement.where(
+                tuple_(order_column, self.model.id)
+                > tuple_(cursor.timestamp, cursor.id)
+            )
+        if limit:
+            statement = statement.limit(limit)
+        result = await session.execute(statement)
+        if exclude:
+            return [self.model(**row._mapping) for row in result], session
+        return list(result.scalars().all()), session
+
+    async def stream(
+        self,
+        exclude: Set[str] = set(),
+        chunk_size: Optional[int] = None,
+        filters: Sequence[ColumnElement[bool]] = (),
+    ) -> AsyncIterator[T]:
+        """
+        Yields every row matching `filters` in (created_at, id) order through
+        a server-side cursor, `chunk_size` rows at a time, so memory stays
+        constant.
+        """
+        statement = (
+            self._select(exclude)
+            .where(*filters)
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(
+                yield_per=chunk_size or Config.read("main.database.stream_chunk_size")
+            )
+        )
+        async with DatabaseEngine().async_session_maker() as session:
+            result = await session.stream(statement)
+            if exclude:
+                async for row in result:
+                    yield self.model(**row._mapping)
+            else:
+                async for entity in result.scalars():
+                    yield entity
+
+    def _select(self, exclude: Set[str]) -> Select:
+        if not exclude:
+            return select(self.model)
+        return select(
+            *[
+                column
+                for column in self.model.__table__.columns
+                if column.name not in exclude
+            ]
+        )
+
+    @async_db_session
+    async def create(
+        self, entity: T, session: Optional[AsyncSession] = None, *args, **kwargs
+    ) -> Tuple[T, AsyncSession]:
+        """Create operation"""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        model = None
+        if entity.id is not None:
+            model = await session.get(self.model, entity.id)
+        if model:
+            return model, session
+        session.add(entity)
+        await session.flush()
+        return entity, session
+
+    @async_db_session
+    async def update(
+        self, entity: T, session: Optional[AsyncSession] = None, *args, **kwargs
+    ) -> Tuple[T, AsyncSession]:
+        """Update operation"""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        model = await session.get(self.model, entity.id)
+        if not model:
+            raise Exception(ExceptionTypes.ID_INVALID)
+        for key, value in entity.to_dict(
+            exclude={"updated_at", "created_at", "id"}
+        ).items():
+            setattr(model, key, value)
+        await session.flush()
+        return model, session
+
+    @async_db_session
+    async def upsert(
+        self,
+        entity: T,
+        conflict_keys: Sequence[str],
+        session: Optional[AsyncSession] = None,
+        *args,
+        **kwargs,
+    ) -> Tuple[T, AsyncSession]:
+        """Single-statement insert-or-update on a unique key"""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        statement = build_upsert(
+            self.model, [entity_values(entity)], conflict_keys
+        ).returning(self.model)
+        result = await session.execute(
+            statement, execution_options={"populate_existing": True}
+        )
+        return result.scalar_one(), session
+
+    @async_db_session
+    async def delete(
+        self, entity: T, session: Optional[AsyncSession] = None, *args, **kwargs
+    ) -> Tuple[T, AsyncSession]:
+        """Delete operation"""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        model = await session.get(self.model, entity.id)
+        if not model:
+            raise Exception(ExceptionTypes.ID_INVALID)
+        await session.delete(model)
+        await session.flush()
+        return model, session
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import Generic, List, Tuple, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+K = TypeVar("K")
+
+
+class BaseAsyncRepository(ABC, Generic[T, K]):
+    @abstractmethod
+    async def create(self, entity: T, *args, **kwargs) -> Tuple[T, AsyncSession]:
+        pass
+
+    @abstractmethod
+    async def update(self, entity: T, *args, **kwargs) -> Tuple[T, AsyncSession]:
+        pass
+
+    @abstractmethod
+    async def delete(self, entity: T, *args, **kwargs) -> Tuple[T, AsyncSession]:
+        pass
+
+    @abstractmethod
+    async def read_by_id(self, id: K, *args, **kwargs) -> Tuple[T, AsyncSession]:
+        pass
+
+    @abstractmethod
+    async def read(self, *args, **kwargs) -> Tuple[List[T], AsyncSession]:
+        pass
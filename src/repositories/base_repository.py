@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generic, List, Tuple, TypeVar
+from typing import Generic, List, Sequence, Tuple, TypeVar
 from sqlalchemy.orm import Session
 
 T = TypeVar("T")
@@ -26,3 +26,21 @@ class BaseRepository(ABC, Generic[T, K]):
     @abstractmethod
     def read(self, *args, **kwargs) -> Tuple[List[T], Session]:
         pass
+
+    @abstractmethod
+    def create_many(
+        self, entities: List[T], *args, **kwargs
+    ) -> Tuple[List[T], Session]:
+        pass
+
+    @abstractmethod
+    def upsert_many(
+        self, entities: List[T], conflict_keys: Sequence[str], *args, **kwargs
+    ) -> Tuple[List[T], Session]:
+        pass
+
+    @abstractmethod
+    def update_many(
+        self, entities: List[T], *args, **kwargs
+    ) -> Tuple[List[T], Session]:
+        pass
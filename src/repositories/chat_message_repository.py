@@ -0,0 +1,24 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.decorators.async_db_session import async_db_session
+from src.models.chat_message import ChatMessage
+from src.repositories.async_repository import AsyncRepository
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
+
+
+class ChatMessageRepository(AsyncRepository[ChatMessage]):
+    @async_db_session
+    async def read_by_session_id(
+        self, session_id: str, session: Optional[AsyncSession] = None
+    ) -> Tuple[List[ChatMessage], AsyncSession]:
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        result = await session.execute(
+            select(ChatMessage)
+            .where(ChatMessage.session_id == session_id)
+            .order_by(ChatMessage.seq)
+        )
+        return list(result.scalars().all()), session
@@ -0,0 +1,65 @@
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from pylib_0xe.config.config import Config
+from sqlalchemy import select
+
+from src.database.database_engine import DatabaseEngine
+from src.models.chat_message import ChatMessage
+from src.models.chat_session import ChatSession
+from src.repositories.async_repository import AsyncRepository
+
+
+class ChatSessionRepository(AsyncRepository[ChatSession]):
+    async def stream_with_messages(
+        self, chunk_size: Optional[int] = None
+    ) -> AsyncIterator[Tuple[ChatSession, List[Dict[str, str]]]]:
+        """
+        Yields every session with its messages. Sessions stream in keyset
+        order off the created_at index, so the first rows go out right away;
+        the messages of each batch of sessions are read in one query that the
+        (session_id, seq) index serves.
+        """
+        chunk_size = chunk_size or Config.read("main.database.stream_chunk_size")
+        batch: List[ChatSession] = []
+        async for chat_session in self.stream(chunk_size=chunk_size):
+            batch.append(chat_session)
+            if len(batch) >= chunk_size:
+                for item in await self._with_messages(batch):
+                    yield item
+                batch = []
+        for item in await self._with_messages(batch):
+            yield item
+
+    async def _with_messages(
+        self, chat_sessions: List[ChatSession]
+    ) -> List[Tuple[ChatSession, List[Dict[str, str]]]]:
+        if not chat_sessions:
+            return []
+        messages: Dict[str, List[Dict[str, str]]] = {
+            chat_session.id: [] for chat_session in chat_sessions
+        }
+        async with DatabaseEngine().async_session_maker() as session:
+            rows = await session.scalars(
+                select(ChatMessage)
+                .where(
+                    ChatMessage.session_id.in_(messages),
+                    ChatMessage.role != "system",
+                )
+                .order_by(ChatMessage.session_id, ChatMessage.seq)
+            )
+            for message in rows:
+                messages[message.session_id].append(message.to_message())
+        return [
+            (chat_session, self._with_legacy(chat_session, messages[chat_session.id]))
+            for chat_session in chat_sessions
+        ]
+
+    @staticmethod
+    def _with_legacy(
+        chat_session: ChatSession, messages: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        # sessions not yet moved to chat_messages still carry the legacy list
+        if messages or not chat_session.messages:
+            return messages
+        return [
+            message for message in chat_session.messages if message["role"] != "system"
+        ]
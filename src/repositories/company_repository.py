@@ -1,19 +1,52 @@
-from typing import Optional, Tuple
-from pylib_0xe.decorators.db_session import db_session
-from pylib_0xe.types.database_types import DatabaseTypes
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.decorators.async_db_session import async_db_session
 from src.models.company import Company
-from src.repositories.repository import Repository
+from src.repositories.async_repository import AsyncRepository
+from src.types.company_status import CompanyStatus
 from src.types.exception_types import ExceptionTypes
 
 
-class CompanyRepository(Repository[Company]):
-    @db_session(DatabaseTypes.I)
-    def read_by_session_id(
-        self, session_id: str, session: Optional[Session] = None
-    ) -> Tuple[Company, Session]:
+class CompanyRepository(AsyncRepository[Company]):
+    @async_db_session
+    async def read_by_session_id(
+        self, session_id: str, session: Optional[AsyncSession] = None
+    ) -> Tuple[Optional[Company], AsyncSession]:
         if not session:
             raise Exception(ExceptionTypes.DB_SESSION_NOT_FOUND)
-        entity = session.query(Company).filter(Company.session_id == session_id).one()
-        return entity, session
+        result = await session.execute(
+            select(Company).where(Company.session_id == session_id)
+        )
+        return result.scalar_one_or_none(), session
+
+    async def read_by_stack(
+        self, stack_name: str, stack_field: Optional[str] = None, **kwargs
+    ) -> Tuple[List[Company], AsyncSession]:
+        """Companies requiring `stack_name` (in `stack_field`, when given)."""
+        return await self.read(
+            filters=[self.requires_stack(stack_name, stack_field)], **kwargs
+        )
+
+    @staticmethod
+    def requires_stack(
+        stack_name: str, stack_field: Optional[str] = None
+    ) -> ColumnElement[bool]:
+        requirement = {"stack_name": stack_name}
+        if stack_field:
+            requirement["stack_field"] = stack_field
+        # jsonb containment, served by the jsonb_path_ops GIN index
+        return Company.data.contains({"requirements": [requirement]})
+
+    @staticmethod
+    def in_industry(company_industry: str) -> ColumnElement[bool]:
+        return Company.data["company_industry"].astext == company_industry
+
+    @staticmethod
+    def for_job_position(job_position: str) -> ColumnElement[bool]:
+        return Company.data["job_position"].astext == job_position
+
+    @staticmethod
+    def with_status(status: CompanyStatus) -> ColumnElement[bool]:
+        return Company.status == status.value
@@ -0,0 +1,115 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.decorators.async_db_session import async_db_session
+from src.models.company import Company
+from src.models.company_requirement import CompanyRequirement
+from src.models.field_facet_count import FieldFacetCount
+from src.models.stack_facet_count import StackFacetCount
+from src.models.term_facet_count import TermFacetCount
+from src.repositories.async_repository import AsyncRepository
+from src.types.api.field_facet import FieldFacet
+from src.types.api.stack_facet import StackFacet
+from src.types.api.term_facet import TermFacet
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
+
+
+class CompanyRequirementRepository(AsyncRepository[CompanyRequirement]):
+    @staticmethod
+    def has_stack(
+        stack_name: str, stack_field: Optional[str] = None
+    ) -> ColumnElement[bool]:
+        """Filter on `Company` for companies requiring the given stack."""
+        matches = select(CompanyRequirement.company_id).where(
+            CompanyRequirement.stack_name == CompanyRequirement.normalize(stack_name)
+        )
+        if stack_field:
+            matches = matches.where(
+                CompanyRequirement.stack_field
+                == CompanyRequirement.normalize(stack_field)
+            )
+        return Company.id.in_(matches)
+
+    @async_db_session
+    async def field_facets(
+        self, limit: int, session: Optional[AsyncSession] = None
+    ) -> Tuple[List[FieldFacet], AsyncSession]:
+        """Read from the counts kept up to date by `IndexCompanyRequirements`."""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        result = await session.execute(
+            select(FieldFacetCount.stack_field, FieldFacetCount.companies)
+            .where(FieldFacetCount.companies > 0)
+            .order_by(FieldFacetCount.companies.desc())
+            .limit(limit)
+        )
+        return [
+            FieldFacet(stack_field=field, companies=count) for field, count in result
+        ], session
+
+    @async_db_session
+    async def stack_facets(
+        self,
+        limit: int,
+        stack_field: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> Tuple[List[StackFacet], AsyncSession]:
+        """
+        The `limit` most required stacks of each field (or of one field),
+        ranked over the kept counts rather than the requirements.
+        """
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        counts = select(StackFacetCount).where(StackFacetCount.companies > 0)
+        if stack_field:
+            counts = counts.where(
+                StackFacetCount.stack_field == CompanyRequirement.normalize(stack_field)
+            )
+        counts = counts.subquery()
+        ranked = select(
+            counts,
+            func.row_number()
+            .over(
+                partition_by=counts.c.stack_field,
+                order_by=counts.c.companies.desc(),
+            )
+            .label("rank"),
+        ).subquery()
+        result = await session.execute(
+            select(ranked.c.stack_field, ranked.c.stack_name, ranked.c.companies)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.stack_field, ranked.c.companies.desc())
+        )
+        return [
+            StackFacet(stack_field=field, stack_name=name, companies=count)
+            for field, name, count in result
+        ], session
+
+    @async_db_session
+    async def term_facets(
+        self,
+        stack_name: str,
+        limit: int,
+        stack_field: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> Tuple[List[TermFacet], AsyncSession]:
+        """How often each deep requirement is asked for a given stack."""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        count = func.sum(TermFacetCount.count)
+        terms = select(TermFacetCount.term, count).where(
+            TermFacetCount.stack_name == CompanyRequirement.normalize(stack_name)
+        )
+        if stack_field:
+            terms = terms.where(
+                TermFacetCount.stack_field == CompanyRequirement.normalize(stack_field)
+            )
+        result = await session.execute(
+            terms.group_by(TermFacetCount.term)
+            .having(count > 0)
+            .order_by(count.desc())
+            .limit(limit)
+        )
+        return [TermFacet(term=term, count=total) for term, total in result], session
@@ -1,12 +1,31 @@
 import logging
 from dataclasses import dataclass
-from typing import Generic, List, Optional, Tuple, Type, TypeVar
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from pylib_0xe.config.config import Config
+from pylib_0xe.utils.time.get_current_time import GetCurrentTime
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 from pylib_0xe.decorators.db_session import db_session
 from pylib_0xe.types.database_types import DatabaseTypes
 from src.types.exception_types import ExceptionTypes
 from src.models.decorated_base import DecoratedBase
 from src.repositories.base_repository import BaseRepository
+from src.repositories.upsert_statement import (
+    build_upsert,
+    conflict_values,
+    entity_values,
+)
 from src.types.server_exception import ServerException
 
 LOGGER = logging.getLogger(__name__)
@@ -82,3 +101,81 @@ class Repository(Generic[T], BaseRepository[T, str]):
         session.delete(entity)
         session.flush()
         return entity, session
+
+    @db_session(DatabaseTypes.I)
+    def create_many(
+        self,
+        entities: List[T],
+        session: Optional[Session] = None,
+        chunk_size: Optional[int] = None,
+        *args,
+        **kwargs,
+    ) -> Tuple[List[T], Session]:
+        """Multi-row insert of all entities in one transaction"""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        created: List[T] = []
+        for chunk in _chunks([entity_values(e) for e in entities], chunk_size):
+            created.extend(
+                session.scalars(insert(self.model).returning(self.model), chunk)
+            )
+        return created, session
+
+    @db_session(DatabaseTypes.I)
+    def upsert_many(
+        self,
+        entities: List[T],
+        conflict_keys: Sequence[str],
+        session: Optional[Session] = None,
+        chunk_size: Optional[int] = None,
+        *args,
+        **kwargs,
+    ) -> Tuple[List[T], Session]:
+        """Multi-row INSERT ... ON CONFLICT DO UPDATE in one transaction"""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        # a statement may not hit the same row twice; the last entity wins
+        rows = {
+            conflict_values(values, conflict_keys): values
+            for values in map(entity_values, entities)
+        }
+        upserted: List[T] = []
+        for chunk in _chunks(list(rows.values()), chunk_size):
+            upserted.extend(
+                session.scalars(
+                    build_upsert(self.model, chunk, conflict_keys).returning(
+                        self.model
+                    ),
+                    execution_options={"populate_existing": True},
+                )
+            )
+        return upserted, session
+
+    @db_session(DatabaseTypes.I)
+    def update_many(
+        self,
+        entities: List[T],
+        session: Optional[Session] = None,
+        chunk_size: Optional[int] = None,
+        *args,
+        **kwargs,
+    ) -> Tuple[List[T], Session]:
+        """Bulk update by primary key (executemany) in one transaction"""
+        if not session:
+            raise ServerException(ExceptionTypes.DB_SESSION_NOT_FOUND)
+        now = GetCurrentTime.get()
+        rows = [
+            {**entity_values(entity), "id": entity.id, "updated_at": now}
+            for entity in entities
+        ]
+        for chunk in _chunks(rows, chunk_size):
+            session.execute(update(self.model), chunk)
+        return entities, session
+
+
+def _chunks(
+    rows: List[Dict[str, Any]], chunk_size: Optional[int]
+) -> Iterator[List[Dict[str, Any]]]:
+    size = chunk_size or Config.read("main.database.bulk_chunk_size")
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Sequence, Tuple, Type
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import Insert, insert
+
+from src.models.decorated_base import DecoratedBase
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
+
+# never overwritten when an existing row is hit
+PROTECTED_COLUMNS = {"id", "created_at"}
+
+
+def entity_values(entity: DecoratedBase) -> Dict[str, Any]:
+    """Column values that were explicitly set on a (transient) entity."""
+    state = inspect(entity)
+    return {
+        attribute.key: state.dict[attribute.key]
+        for attribute in state.mapper.column_attrs
+        if attribute.key in state.dict
+    }
+
+
+def conflict_values(
+    values: Dict[str, Any], conflict_keys: Sequence[str]
+) -> Tuple[Any, ...]:
+    """The row's conflict key; every one of its columns has to be set."""
+    missing = [key for key in conflict_keys if key not in values]
+    if missing:
+        raise ServerException(
+            ExceptionTypes.DATA_INVALID,
+            detail=f"conflict key column(s) not set: {', '.join(missing)}",
+        )
+    return tuple(values[key] for key in conflict_keys)
+
+
+def build_upsert(
+    model: Type[DecoratedBase],
+    rows: List[Dict[str, Any]],
+    conflict_keys: Sequence[str],
+) -> Insert:
+    """
+    `INSERT ... ON CONFLICT (conflict_keys) DO UPDATE` for `rows`. Only the
+    columns given in the rows (plus `updated_at`) are updated on conflict.
+    """
+    statement = insert(model).values(rows)
+    given = {key for row in rows for key in row} | {"updated_at"}
+    protected = PROTECTED_COLUMNS | set(conflict_keys)
+    return statement.on_conflict_do_update(
+        index_elements=list(conflict_keys),
+        set_={
+            column.name: statement.excluded[column.name]
+            for column in model.__table__.columns
+            if column.name in given and column.name not in protected
+        },
+    )
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ActorMessageTypes(Enum):
+    GREETING = "greeting"
+    USER_MESSAGE = "user_message"
+    DRAFT = "draft"
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class AgentSchedulerStats(BaseModel):
+    concurrency: int
+    queue_capacity: int
+    queue_depth: int
+    queued_sessions: int
+    in_flight: int
+    submitted: int
+    completed: int
+    failed: int
+    rejected: int
+    avg_wait_seconds: float
+    max_wait_seconds: float
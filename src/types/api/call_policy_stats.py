@@ -0,0 +1,16 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class CallPolicyStats(BaseModel):
+    calls: int
+    succeeded: int
+    failed: int
+    retries: int
+    hedged: int
+    hedge_wins: int
+    rejected: int
+    circuit_state: str
+    circuit_opened: int
+    retry_after: int
+    p95_seconds: Dict[str, Optional[float]]
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class FieldFacet(BaseModel):
+    stack_field: str
+    companies: int
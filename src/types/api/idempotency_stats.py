@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class IdempotencyStats(BaseModel):
+    size: int
+    accepted: int
+    deduplicated: int
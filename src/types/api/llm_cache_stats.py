@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class LlmCacheStats(BaseModel):
+    backend: str
+    size: int
+    capacity: int
+    memory_hits: int
+    database_hits: int
+    misses: int
+    bypassed: int
+    writes: int
+    evicted: int
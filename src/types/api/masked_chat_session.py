@@ -8,3 +8,4 @@ class MaskedChatSession(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     messages: Optional[str] = None
+    prompt_version: Optional[str] = None
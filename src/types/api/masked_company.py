@@ -1,5 +1,6 @@
-from typing import Optional
-from pydantic import BaseModel
+import json
+from typing import Any, Optional
+from pydantic import BaseModel, field_validator
 from datetime import datetime
 
 
@@ -8,3 +9,12 @@ class MaskedCompany(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     data: Optional[str] = None
+    status: Optional[str] = None
+
+    @field_validator("data", mode="before")
+    @classmethod
+    def dump_data(cls, data: Any) -> Any:
+        # stored as JSONB, still served as the JSON string clients expect
+        if isinstance(data, (dict, list)):
+            return json.dumps(data)
+        return data
@@ -0,0 +1,23 @@
+import base64
+from datetime import datetime
+from pydantic import BaseModel, ValidationError
+
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
+
+
+class PageCursor(BaseModel):
+    """Keyset position: the sort column value and id of the last row served."""
+
+    timestamp: datetime
+    id: str
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode()
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        try:
+            return cls.model_validate_json(base64.urlsafe_b64decode(token.encode()))
+        except (ValueError, ValidationError):
+            raise ServerException(ExceptionTypes.CURSOR_INVALID)
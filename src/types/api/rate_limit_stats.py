@@ -0,0 +1,9 @@
+from typing import Dict
+from pydantic import BaseModel
+
+
+class RateLimitStats(BaseModel):
+    backend: str
+    buckets: int
+    allowed: Dict[str, int]
+    limited: Dict[str, int]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class StackFacet(BaseModel):
+    stack_field: str
+    stack_name: str
+    companies: int
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class TermFacet(BaseModel):
+    term: str
+    count: int
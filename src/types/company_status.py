@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class CompanyStatus(Enum):
+    # collected during the interview, may still miss fields
+    DRAFT = "draft"
+    # a validated JobPostingOutput
+    FINAL = "final"
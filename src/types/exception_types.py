@@ -17,3 +17,9 @@ class ExceptionTypes(Enum):
     TOKEN_INVALID = "token_invalid"
     IMAGE_INVALID = "image_invalid"
     INTERNAL_ERROR = "internal_error"
+    PROMPT_VERSION_INVALID = "prompt_version_invalid"
+    AGENT_QUEUE_FULL = "agent_queue_full"
+    CURSOR_INVALID = "cursor_invalid"
+    DATA_INVALID = "data_invalid"
+    LLM_UNAVAILABLE = "llm_unavailable"
+    RATE_LIMITED = "rate_limited"
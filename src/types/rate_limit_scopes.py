@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class RateLimitScopes(Enum):
+    SESSION = "session"
+    CLIENT = "client"
@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class RouteTypes(Enum):
+    """The kinds of LLM calls an agent makes; each one has its own model."""
+
+    GREETING = "greeting"
+    QUESTION = "question"
+    DRAFT = "draft"
+    SUMMARY = "summary"
+    EXTRACTION = "extraction"
+    REPAIR = "repair"
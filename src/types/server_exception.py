@@ -5,7 +5,14 @@ from ..types.exception_types import ExceptionTypes
 class ServerException(Exception):
     exception_type: ExceptionTypes
     detail: str
+    retry_after: Optional[int]
 
-    def __init__(self, exception_type: ExceptionTypes, detail: Optional[str] = None):
+    def __init__(
+        self,
+        exception_type: ExceptionTypes,
+        detail: Optional[str] = None,
+        retry_after: Optional[int] = None,
+    ):
         self.exception_type = exception_type
         self.detail = detail or exception_type.value
+        self.retry_after = retry_after
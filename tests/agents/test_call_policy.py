@@ -0,0 +1,190 @@
+import asyncio
+from typing import List, Optional
+
+import httpx
+import openai
+import pytest
+
+from src.agents.call_policy import CallPolicy
+from src.types.exception_types import ExceptionTypes
+from src.types.route_types import RouteTypes
+from src.types.server_exception import ServerException
+
+REQUEST = httpx.Request("POST", "http://llm/v1/chat/completions")
+
+
+def policy(**kwargs) -> CallPolicy:
+    options = {
+        "deadline": 1.0,
+        "max_attempts": 3,
+        "backoff_base": 0.001,
+        "backoff_max": 0.001,
+        "hedge": False,
+        "hedge_min_samples": 1,
+        "hedge_window": 10,
+        "failure_threshold": 5,
+        "reset_timeout": 30,
+        **kwargs,
+    }
+    return CallPolicy(**options)
+
+
+def provider_error(status: int, headers=None) -> openai.APIStatusError:
+    response = httpx.Response(status, headers=headers, request=REQUEST)
+    error = {429: openai.RateLimitError, 500: openai.InternalServerError}.get(
+        status, openai.BadRequestError
+    )
+    return error("provider error", response=response, body=None)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_retries_a_retryable_error():
+    calls = policy()
+    attempts: List[int] = []
+
+    async def request():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise provider_error(500)
+        return "reply"
+
+    assert run(calls.create(RouteTypes.QUESTION, request)) == "reply"
+    stats = calls.stats()
+    assert (stats.calls, stats.succeeded, stats.retries) == (1, 1, 1)
+    assert stats.circuit_state == "closed"
+
+
+def test_gives_up_after_the_last_attempt():
+    calls = policy(max_attempts=2)
+
+    async def request():
+        raise openai.APIConnectionError(request=REQUEST)
+
+    with pytest.raises(ServerException) as error:
+        run(calls.create(RouteTypes.QUESTION, request))
+    assert error.value.exception_type is ExceptionTypes.LLM_UNAVAILABLE
+    assert error.value.retry_after >= 1
+    assert calls.stats().failed == 1
+
+
+def test_waits_at_least_the_providers_retry_after():
+    calls = policy()
+    assert calls._backoff(0, provider_error(429, {"retry-after": "3"})) == 3
+    assert calls._backoff(0, provider_error(429, {"retry-after": "soon"})) <= 0.001
+
+
+def test_raises_llm_unavailable_once_the_deadline_passed():
+    calls = policy(deadline=0.05)
+
+    async def request():
+        await asyncio.sleep(1)
+
+    with pytest.raises(ServerException) as error:
+        run(calls.create(RouteTypes.QUESTION, request))
+    assert error.value.exception_type is ExceptionTypes.LLM_UNAVAILABLE
+    assert calls.stats().failed == 1
+
+
+def test_does_not_retry_a_rejected_request():
+    calls = policy()
+    attempts: List[int] = []
+
+    async def request():
+        attempts.append(len(attempts))
+        raise provider_error(400)
+
+    with pytest.raises(ServerException) as error:
+        run(calls.create(RouteTypes.QUESTION, request))
+    assert error.value.exception_type is ExceptionTypes.LLM_UNAVAILABLE
+    assert len(attempts) == 1
+    # the provider answered, so it counts as healthy
+    assert calls.breaker.failures == 0
+
+
+def test_fails_fast_while_the_circuit_is_open():
+    calls = policy(max_attempts=1, failure_threshold=1)
+
+    async def request():
+        raise provider_error(500)
+
+    for _ in range(2):
+        with pytest.raises(ServerException):
+            run(calls.create(RouteTypes.QUESTION, request))
+    stats = calls.stats()
+    assert (stats.failed, stats.rejected, stats.circuit_state) == (1, 1, "open")
+
+
+def test_a_hedged_request_can_win():
+    calls = policy(hedge=True)
+    calls.latencies[RouteTypes.QUESTION].append(0.01)
+    attempts: List[int] = []
+
+    async def request():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            await asyncio.sleep(1)
+            return "slow"
+        return "fast"
+
+    assert run(calls.create(RouteTypes.QUESTION, request)) == "fast"
+    stats = calls.stats()
+    assert (stats.hedged, stats.hedge_wins) == (1, 1)
+
+
+class FakeStream:
+    def __init__(
+        self, chunks: List[str], error: Optional[Exception] = None, delay: float = 0
+    ):
+        self.chunks = chunks
+        self.error = error
+        self.delay = delay
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield chunk
+        if self.error:
+            raise self.error
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def read(stream) -> str:
+    return "".join([chunk async for chunk in stream])
+
+
+def test_a_failed_stream_read_is_a_failed_call():
+    calls = policy()
+    stream = FakeStream(["a", "b"], openai.APIConnectionError(request=REQUEST))
+
+    async def request():
+        return stream
+
+    with pytest.raises(ServerException) as error:
+        run(calls.stream(RouteTypes.QUESTION, request, read))
+    assert error.value.exception_type is ExceptionTypes.LLM_UNAVAILABLE
+    assert stream.closed
+    stats = calls.stats()
+    assert (stats.succeeded, stats.failed) == (0, 1)
+    assert calls.breaker.failures == 1
+
+
+def test_a_stream_read_shares_the_deadline():
+    calls = policy(deadline=0.05)
+    stream = FakeStream(["a"] * 10, delay=0.02)
+
+    async def request():
+        return stream
+
+    with pytest.raises(ServerException) as error:
+        run(calls.stream(RouteTypes.QUESTION, request, read))
+    assert error.value.exception_type is ExceptionTypes.LLM_UNAVAILABLE
+    assert stream.closed
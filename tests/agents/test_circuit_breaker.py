@@ -0,0 +1,89 @@
+import types
+
+import pytest
+
+from src.agents import circuit_breaker
+from src.agents.circuit_breaker import CircuitBreaker
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(
+        circuit_breaker, "time", types.SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+def opened(breaker: CircuitBreaker) -> CircuitBreaker:
+    for _ in range(breaker.failure_threshold):
+        breaker.failure()
+    return breaker
+
+
+def test_stays_closed_below_the_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    breaker.failure()
+    breaker.failure()
+    breaker.success()
+    breaker.failure()
+    breaker.failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+    assert breaker.retry_after() == 0
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = opened(CircuitBreaker(failure_threshold=3, reset_timeout=10))
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.times_opened == 1
+    clock.now += 2.5
+    assert breaker.retry_after() == 8
+
+
+def test_lets_a_single_trial_through_after_the_timeout(clock):
+    breaker = opened(CircuitBreaker(failure_threshold=2, reset_timeout=10))
+    clock.now += 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert breaker.retry_after() == 1
+
+
+def test_a_successful_trial_closes_it(clock):
+    breaker = opened(CircuitBreaker(failure_threshold=2, reset_timeout=10))
+    clock.now += 10
+    breaker.allow()
+    breaker.success()
+    assert breaker.state == "closed"
+    # the failure count starts over
+    breaker.failure()
+    assert breaker.allow()
+
+
+def test_a_failed_trial_reopens_it(clock):
+    breaker = opened(CircuitBreaker(failure_threshold=2, reset_timeout=10))
+    clock.now += 10
+    breaker.allow()
+    breaker.failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_after() == 10
+    assert breaker.times_opened == 2
+
+
+def test_an_abandoned_trial_lets_the_next_one_through(clock):
+    breaker = opened(CircuitBreaker(failure_threshold=2, reset_timeout=10))
+    clock.now += 10
+    breaker.allow()
+    breaker.abandon()
+    assert breaker.allow()
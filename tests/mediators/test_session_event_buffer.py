@@ -0,0 +1,52 @@
+from typing import List
+
+from src.mediators.session_event_buffer import SessionEventBuffer
+
+
+def fill(buffer: SessionEventBuffer, events: List[str]) -> None:
+    for event in events:
+        buffer.append({"id": str(buffer.next_id()), "event": event, "data": event})
+
+
+def kinds(events) -> List[str]:
+    return [event["event"] for event in events]
+
+
+def test_ids_increase():
+    buffer = SessionEventBuffer(8)
+    ids = [buffer.next_id() for _ in range(100)]
+    assert ids == sorted(set(ids))
+
+
+def test_keeps_only_the_latest_events():
+    buffer = SessionEventBuffer(3)
+    fill(buffer, ["done", "delta", "delta", "delta"])
+    assert kinds(buffer.events) == ["delta", "delta", "delta"]
+
+
+def test_a_turn_end_replaces_its_deltas():
+    buffer = SessionEventBuffer(8)
+    fill(buffer, ["done", "delta", "delta", "done", "delta", "error"])
+    assert kinds(buffer.events) == ["done", "done", "error"]
+
+
+def test_replays_after_the_last_event_id():
+    buffer = SessionEventBuffer(8)
+    fill(buffer, ["done", "delta", "delta"])
+    first = int(buffer.events[0]["id"])
+    assert kinds(buffer.since(first)) == ["delta", "delta"]
+    assert buffer.since(buffer.last_id) == []
+
+
+def test_a_first_connect_gets_the_greeting_of_a_new_session():
+    buffer = SessionEventBuffer(8)
+    fill(buffer, ["delta", "done"])
+    assert kinds(buffer.since(None)) == ["done"]
+
+
+def test_a_first_connect_only_gets_the_turn_in_progress():
+    buffer = SessionEventBuffer(8)
+    fill(buffer, ["done", "done", "delta", "delta"])
+    assert kinds(buffer.since(None)) == ["delta", "delta"]
+    fill(buffer, ["done"])
+    assert buffer.since(None) == []
@@ -0,0 +1,164 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from src.orchestrators.agent_scheduler import AgentScheduler
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
+
+
+def scheduler(concurrency: int = 1, max_queue_size: int = 10) -> AgentScheduler:
+    return AgentScheduler(
+        concurrency=concurrency,
+        max_queue_size=max_queue_size,
+        drain_timeout=1,
+        retry_after=5,
+    )
+
+
+def test_runs_at_most_concurrency_jobs_at_once():
+    async def run():
+        agents = scheduler(concurrency=2)
+        agents.start()
+        running, peak = 0, 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for index in range(6):
+            agents.submit(f"session-{index}", job)
+        await agents.shutdown()
+        return peak, agents.stats()
+
+    peak, stats = asyncio.run(run())
+    assert peak == 2
+    assert stats.completed == 6
+    assert stats.queue_depth == 0
+
+
+def test_serves_sessions_round_robin():
+    async def run():
+        agents = scheduler()
+        order: List[str] = []
+
+        def job(name: str):
+            async def factory():
+                order.append(name)
+
+            return factory
+
+        # queue everything before the single worker starts
+        agents.available = asyncio.Semaphore(0)
+        for name in ("a1", "a2", "a3"):
+            agents.submit("a", job(name))
+        agents.submit("b", job("b1"))
+        agents.workers = [asyncio.create_task(agents._work())]
+        await agents.shutdown()
+        return order
+
+    assert asyncio.run(run()) == ["a1", "b1", "a2", "a3"]
+
+
+def test_rejects_jobs_when_the_queue_is_full():
+    async def run():
+        agents = scheduler(max_queue_size=2)
+        agents.available = asyncio.Semaphore(0)
+
+        async def job():
+            pass
+
+        agents.submit("a", job)
+        agents.submit("b", job)
+        with pytest.raises(ServerException) as error:
+            agents.submit("c", job)
+        return error.value, agents.stats()
+
+    error, stats = asyncio.run(run())
+    assert error.exception_type is ExceptionTypes.AGENT_QUEUE_FULL
+    assert error.retry_after == 5
+    assert stats.rejected == 1
+
+
+def test_continuations_are_not_held_to_the_queue_size():
+    async def run():
+        agents = scheduler(max_queue_size=1)
+        agents.available = asyncio.Semaphore(0)
+
+        async def job():
+            pass
+
+        agents.submit("a", job)
+        agents.submit("b", job, continuation=True)
+        return agents.stats()
+
+    assert asyncio.run(run()).queue_depth == 2
+
+
+def test_rejects_jobs_before_start_and_after_shutdown():
+    async def run():
+        agents = scheduler()
+
+        async def job():
+            pass
+
+        with pytest.raises(ServerException):
+            agents.submit("a", job)
+        agents.start()
+        await agents.shutdown()
+        with pytest.raises(ServerException):
+            agents.submit("a", job)
+
+    asyncio.run(run())
+
+
+def test_a_failing_job_does_not_stop_the_worker():
+    async def run():
+        agents = scheduler()
+        agents.start()
+        done = []
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def working():
+            done.append(True)
+
+        agents.submit("a", failing)
+        agents.submit("a", working)
+        await agents.shutdown()
+        return done, agents.stats()
+
+    done, stats = asyncio.run(run())
+    assert done == [True]
+    assert stats.failed == 1
+    assert stats.completed == 1
+
+
+def test_shutdown_cancels_jobs_past_the_drain_timeout():
+    async def run():
+        agents = AgentScheduler(
+            concurrency=1, max_queue_size=10, drain_timeout=0.05, retry_after=5
+        )
+        agents.start()
+        cancelled = asyncio.Event()
+
+        async def stuck():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        agents.submit("a", stuck)
+        await asyncio.sleep(0)
+        await agents.shutdown()
+        return cancelled.is_set(), agents.workers
+
+    cancelled, workers = asyncio.run(run())
+    assert cancelled
+    assert workers == []
@@ -0,0 +1,197 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from src.orchestrators.agent_scheduler import AgentScheduler
+from src.orchestrators.session_actor import ActorMessage, SessionActor
+from src.types.actor_message_types import ActorMessageTypes
+from src.types.exception_types import ExceptionTypes
+from src.types.server_exception import ServerException
+
+
+def user(text: str) -> ActorMessage:
+    return ActorMessage(ActorMessageTypes.USER_MESSAGE, text)
+
+
+def draft(turn_start: int) -> ActorMessage:
+    return ActorMessage(ActorMessageTypes.DRAFT, str(turn_start))
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.calls: List[object] = []
+        self.running = 0
+        self.overlapped = False
+        self.idle: List[str] = []
+        self.errors: List[ServerException] = []
+
+    async def greet(self, session_id: str, prompt_version: str) -> None:
+        await self._turn(("greet", prompt_version))
+
+    async def reply(self, session_id: str, user_messages: List[str]) -> None:
+        await self._turn(user_messages)
+
+    async def draft(self, session_id: str, turn_start: str) -> None:
+        await self._turn(("draft", turn_start))
+
+    async def fail(self, session_id: str, error: ServerException) -> None:
+        self.errors.append(error)
+
+    def on_idle(self, session_id: str) -> None:
+        self.idle.append(session_id)
+
+    async def _turn(self, call: object) -> None:
+        self.running += 1
+        self.overlapped |= self.running > 1
+        self.calls.append(call)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+
+
+def actor(recorder: Recorder, scheduler: AgentScheduler, **kwargs) -> SessionActor:
+    options = {"max_mailbox": 16, "coalesce": True, **kwargs}
+    return SessionActor(
+        session_id="s",
+        scheduler=scheduler,
+        greet=recorder.greet,
+        reply=recorder.reply,
+        draft=recorder.draft,
+        fail=recorder.fail,
+        on_idle=recorder.on_idle,
+        **options,
+    )
+
+
+def run_actor(batches: List[List[ActorMessage]], **kwargs) -> Recorder:
+    """Posts each batch once the previous one is being answered."""
+
+    async def run():
+        recorder = Recorder()
+        scheduler = AgentScheduler(
+            concurrency=4, max_queue_size=16, drain_timeout=1, retry_after=5
+        )
+        scheduler.start()
+        session = actor(recorder, scheduler, **kwargs)
+        for batch in batches:
+            for message in batch:
+                session.post(message)
+            await asyncio.sleep(0.002)
+        while not session.is_idle():
+            await asyncio.sleep(0.005)
+        await scheduler.shutdown()
+        return recorder
+
+    return asyncio.run(run())
+
+
+def test_coalesces_messages_queued_behind_a_turn():
+    recorder = run_actor([[user("a")], [user("b"), user("c")]])
+    assert recorder.calls == [["a"], ["b", "c"]]
+    assert not recorder.overlapped
+    assert recorder.idle == ["s"]
+
+
+def test_answers_one_message_per_turn_without_coalescing():
+    recorder = run_actor([[user("a"), user("b"), user("c")]], coalesce=False)
+    assert recorder.calls == [["a"], ["b"], ["c"]]
+    assert not recorder.overlapped
+
+
+def test_never_merges_a_greeting_with_user_messages():
+    recorder = run_actor(
+        [[ActorMessage(ActorMessageTypes.GREETING, "v2"), user("a"), user("b")]]
+    )
+    assert recorder.calls == [("greet", "v2"), ["a", "b"]]
+
+
+def test_rejects_posts_beyond_the_mailbox():
+    async def run():
+        scheduler = AgentScheduler(
+            concurrency=1, max_queue_size=16, drain_timeout=1, retry_after=5
+        )
+        scheduler.start()
+        session = actor(Recorder(), scheduler, max_mailbox=2)
+        session.post(user("a"))
+        session.post(user("b"))
+        with pytest.raises(ServerException) as error:
+            session.post(user("c"))
+        await scheduler.shutdown()
+        return error.value
+
+    error = asyncio.run(run())
+    assert error.exception_type is ExceptionTypes.AGENT_QUEUE_FULL
+
+
+def test_one_queued_draft_job_covers_later_turns():
+    recorder = run_actor([[user("a")], [draft(1), user("b"), draft(3)]])
+    assert recorder.calls == [["a"], ("draft", "1"), ["b"]]
+    assert not recorder.overlapped
+
+
+def test_never_refuses_a_draft_job():
+    async def run():
+        scheduler = AgentScheduler(
+            concurrency=1, max_queue_size=16, drain_timeout=1, retry_after=5
+        )
+        scheduler.start()
+        recorder = Recorder()
+        session = actor(recorder, scheduler, max_mailbox=1)
+        session.post(user("a"))
+        session.post(draft(1))
+        while not session.is_idle():
+            await asyncio.sleep(0.005)
+        await scheduler.shutdown()
+        return recorder
+
+    assert asyncio.run(run()).calls == [["a"], ("draft", "1")]
+
+
+def test_answers_queued_messages_while_the_scheduler_is_full():
+    async def run():
+        scheduler = AgentScheduler(
+            concurrency=1, max_queue_size=1, drain_timeout=1, retry_after=5
+        )
+        scheduler.start()
+        recorder = Recorder()
+        session = actor(recorder, scheduler)
+        session.post(user("a"))
+        await asyncio.sleep(0.002)
+        session.post(user("b"))
+
+        async def other():
+            pass
+
+        # another session takes the only queue slot
+        scheduler.submit("other", other)
+        while not session.is_idle():
+            await asyncio.sleep(0.005)
+        await scheduler.shutdown()
+        return recorder
+
+    recorder = asyncio.run(run())
+    assert recorder.calls == [["a"], ["b"]]
+    assert recorder.errors == []
+
+
+def test_reports_messages_it_cannot_answer_any_more():
+    async def run():
+        scheduler = AgentScheduler(
+            concurrency=1, max_queue_size=16, drain_timeout=1, retry_after=5
+        )
+        scheduler.start()
+        recorder = Recorder()
+        session = actor(recorder, scheduler)
+        session.post(user("a"))
+        await asyncio.sleep(0.002)
+        session.post(user("b"))
+        await scheduler.shutdown()
+        return recorder, session
+
+    recorder, session = asyncio.run(run())
+    assert recorder.calls == [["a"]]
+    assert [error.exception_type for error in recorder.errors] == [
+        ExceptionTypes.AGENT_QUEUE_FULL
+    ]
+    assert session.is_idle()
+    assert recorder.idle == ["s"]